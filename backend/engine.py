@@ -2,10 +2,14 @@
 # All math: probability curves, floorplan calcs, aging classification,
 # pricing elasticity, exit path scoring, waterfall generation, alarm generation.
 
+import functools
+import heapq
 import math
-import statistics
+import operator
 from datetime import date, timedelta
-from typing import List, Optional, Dict, Any
+from typing import List, NamedTuple, Optional, Dict, Any, Tuple
+
+import numpy as np
 
 
 # ---------------------------------------------------------------------------
@@ -20,6 +24,15 @@ BASE_LAMBDA = 0.035  # base daily hazard rate
 DEMAND_MULTIPLIER_RANGE = (0.5, 2.0)  # low demand = slow, high demand = fast
 PRICE_SENSITIVITY = 0.0015  # per dollar below market, probability boost
 
+# Demand multiplier range unpacked into scalars for the hot path
+_DEMAND_FACTOR_MIN = DEMAND_MULTIPLIER_RANGE[0]
+_DEMAND_FACTOR_SPAN = DEMAND_MULTIPLIER_RANGE[1] - DEMAND_MULTIPLIER_RANGE[0]
+_LN2 = math.log(2.0)  # half-life -> hazard rate
+_NEG_PRICE_SENSITIVITY = -PRICE_SENSITIVITY
+
+# Vehicles per vectorized block in run_full_analysis_batch
+_BATCH_BLOCK_SIZE = 1024
+
 
 # ---------------------------------------------------------------------------
 # HELPER: Clamp
@@ -44,45 +57,53 @@ def compute_lambda(
     Compute the daily hazard rate (lambda) for sale probability.
     Higher lambda = faster expected sale.
     """
+    return float(_compute_lambda_batch(*(np.asarray(x, dtype=np.float64) for x in (
+        median_days_to_sale, demand_score, price_vs_market,
+        days_already_held, views_last_7, leads_last_7,
+    ))))
+
+
+def _compute_lambda_batch(
+    median_days: np.ndarray,
+    demand_score: np.ndarray,
+    price_vs_market: np.ndarray,
+    days_already_held: np.ndarray,
+    views_last_7: np.ndarray,
+    leads_last_7: np.ndarray,
+) -> np.ndarray:
+    """
+    Daily hazard rate over N vehicles (or 0-d arrays for one). Inputs are
+    the compute_lambda arguments as float arrays.
+    """
     # Base lambda from median days to sale
-    if median_days_to_sale > 0:
-        base = math.log(2) / median_days_to_sale
-    else:
-        base = BASE_LAMBDA
+    base = np.full(median_days.shape, BASE_LAMBDA)
+    np.divide(_LN2, median_days, out=base, where=median_days > 0)
 
     # Demand adjustment: score 0-100 maps to multiplier range
-    demand_factor = DEMAND_MULTIPLIER_RANGE[0] + (
-        (demand_score / 100) * (DEMAND_MULTIPLIER_RANGE[1] - DEMAND_MULTIPLIER_RANGE[0])
-    )
+    demand_factor = _DEMAND_FACTOR_MIN + (demand_score / 100) * _DEMAND_FACTOR_SPAN
 
     # Price adjustment: below market boosts, above market penalizes
-    price_factor = 1.0 + (price_vs_market * PRICE_SENSITIVITY * -1)
-    price_factor = clamp(price_factor, 0.3, 2.5)
-
-    # Engagement signal boost
-    signal_boost = 1.0
-    if views_last_7 > 50:
-        signal_boost += 0.1
-    if views_last_7 > 100:
-        signal_boost += 0.1
-    if leads_last_7 > 3:
-        signal_boost += 0.15
-    if leads_last_7 > 8:
-        signal_boost += 0.15
+    price_factor = np.clip(1.0 + (price_vs_market * _NEG_PRICE_SENSITIVITY), 0.3, 2.5)
+
+    # Engagement signal boost (bools add as 0/1 — no branches)
+    signal_boost = (
+        1.0
+        + 0.1 * (views_last_7 > 50)
+        + 0.1 * (views_last_7 > 100)
+        + 0.15 * (leads_last_7 > 3)
+        + 0.15 * (leads_last_7 > 8)
+    )
 
     # Aging penalty: vehicles get stale
-    aging_penalty = 1.0
-    if days_already_held > 30:
-        aging_penalty -= 0.05 * ((days_already_held - 30) / 30)
-    aging_penalty = clamp(aging_penalty, 0.4, 1.0)
+    aging_penalty = np.clip(1.0 - 0.05 * (np.maximum(0, days_already_held - 30) / 30), 0.4, 1.0)
 
     lam = base * demand_factor * price_factor * signal_boost * aging_penalty
-    return clamp(lam, 0.001, 0.15)
+    return np.clip(lam, 0.001, 0.15)
 
 
 def cumulative_sell_probability(lam: float, day: int) -> float:
     """P(sold by day T) = 1 - e^(-lambda * T)"""
-    return 1.0 - math.exp(-lam * day)
+    return -math.expm1(-lam * day)
 
 
 def daily_sell_probability(lam: float, day: int) -> float:
@@ -91,48 +112,100 @@ def daily_sell_probability(lam: float, day: int) -> float:
 
 
 def compute_probabilities(lam: float) -> Dict[str, float]:
-    return {
-        "p30": round(cumulative_sell_probability(lam, 30), 4),
-        "p60": round(cumulative_sell_probability(lam, 60), 4),
-        "p90": round(cumulative_sell_probability(lam, 90), 4),
-    }
+    return _scalars(_probabilities_batch(np.float64(lam)))
+
+
+def _probabilities_batch(lam) -> Dict[str, np.ndarray]:
+    """p30/p60/p90 for a scalar or (N,) lambda."""
+    return {f"p{t}": np.round(-np.expm1(-lam * t), 4) for t in (30, 60, 90)}
+
+
+def _scalars(cols: Dict[str, np.ndarray]) -> Dict[str, float]:
+    """Single-vehicle batch output as plain floats."""
+    return {k: float(v) for k, v in cols.items()}
 
 
 # ---------------------------------------------------------------------------
 # 2) DAILY CURVE (90 data points for hover UI)
 # ---------------------------------------------------------------------------
+CURVE_KEYS = (
+    "day",
+    "daily_sell_probability",
+    "cumulative_sell_probability",
+    "floorplan_cost_to_date",
+    "gross_erosion_to_date",
+)
+
+
 def generate_daily_curve(
     lam: float,
     total_cost: float,
     list_price: float,
     daily_floorplan: float,
     days_already_held: int = 0,
-) -> List[Dict[str, Any]]:
+) -> Dict[str, List[Any]]:
     """
-    Returns 90 objects: day 1-90 from TODAY (not from acquisition).
-    Each point includes:
+    Returns the curve for day 1-90 from TODAY (not from acquisition) in
+    columnar form — one 90-long list per key:
+      - day
       - daily_sell_probability
       - cumulative_sell_probability
       - floorplan_cost_to_date (from acquisition, so includes days_already_held)
       - gross_erosion_to_date (how much gross has shrunk since acquisition)
     """
-    curve = []
-    for d in range(1, 91):
-        total_day = days_already_held + d
-        cum_p = cumulative_sell_probability(lam, d)
-        daily_p = daily_sell_probability(lam, d)
-        floorplan_to_date = daily_floorplan * total_day
-        potential_gross = list_price - total_cost
-        gross_erosion = floorplan_to_date  # erosion = accumulated carry cost
-
-        curve.append({
-            "day": d,
-            "daily_sell_probability": round(daily_p, 5),
-            "cumulative_sell_probability": round(cum_p, 4),
-            "floorplan_cost_to_date": round(floorplan_to_date, 2),
-            "gross_erosion_to_date": round(gross_erosion, 2),
-        })
-    return curve
+    fp_sched = _floorplan_schedule(daily_floorplan, days_already_held)
+    return _curve_dict(*(col.tolist() for col in _curve_columns(lam, fp_sched)))
+
+
+def _floorplan_schedule(daily_floorplan, days_already_held, horizon: int = 90):
+    """
+    Floorplan cost accumulated since acquisition at day 1..horizon from today.
+    Inputs may be scalars or (N, 1) arrays. Computed once per analysis and
+    shared by the curve and carry projections.
+    """
+    return daily_floorplan * (days_already_held + np.arange(1, horizon + 1, dtype=np.float64))
+
+
+def _curve_columns(lam, fp_sched):
+    """
+    Rounded curve columns (daily_p, cum_p, floorplan_to_date) for days 1-90.
+    lam may be a scalar or (N, 1) array — output is then (90,) or (N, 90).
+    Each column is rounded once, in a single vectorized pass.
+    """
+    d = np.arange(1, 91, dtype=np.float64)
+    # e^(-lambda * d) == (e^-lambda)^d: one exp per vehicle, then powers
+    exp_term = np.exp(-lam) ** d
+    cum_p = 1.0 - exp_term
+    daily_p = lam * exp_term
+    floorplan_to_date = fp_sched[..., :90]
+
+    return (
+        np.round(daily_p, 5),
+        np.round(cum_p, 4),
+        np.round(floorplan_to_date, 2),
+    )
+
+
+def _curve_dict(daily_p, cum_p, floorplan_to_date) -> Dict[str, List[Any]]:
+    return {
+        "day": list(range(1, len(daily_p) + 1)),
+        "daily_sell_probability": daily_p,
+        "cumulative_sell_probability": cum_p,
+        "floorplan_cost_to_date": floorplan_to_date,
+        "gross_erosion_to_date": floorplan_to_date,  # erosion = accumulated carry cost
+    }
+
+
+def slice_curve(curve: Any, days: int) -> Dict[str, List[Any]]:
+    """
+    First `days` points of a stored curve, in columnar form. Reports saved
+    before the columnar layout hold a list of point dicts; those are
+    converted on the way out.
+    """
+    if isinstance(curve, list):
+        keys = curve[0].keys() if curve else CURVE_KEYS
+        curve = {k: [p[k] for p in curve] for k in keys}
+    return {k: v[:days] for k, v in curve.items()}
 
 
 # ---------------------------------------------------------------------------
@@ -147,6 +220,13 @@ def classify_aging(days_in_inventory: int, p30: float) -> str:
         return "danger"
 
 
+def classify_aging_batch(days_in_inventory: np.ndarray, p30: np.ndarray) -> np.ndarray:
+    """classify_aging over arrays of vehicles — same cut-offs, no per-row branching."""
+    healthy = (days_in_inventory <= 30) & (p30 >= 0.35)
+    at_risk = (days_in_inventory <= 60) | (p30 >= 0.20)
+    return np.select([healthy, at_risk], ["healthy", "at_risk"], default="danger")
+
+
 # ---------------------------------------------------------------------------
 # 4) INFLECTION POINT
 #    The day where expected marginal gain from holding < marginal carry cost
@@ -163,66 +243,103 @@ def compute_inflection_day(
     Find the day (from today) where holding one more day costs more
     than the expected marginal revenue gain.
     """
-    potential_retail_gross = list_price - total_cost
+    return int(_inflection_days(
+        lam, list_price, total_cost, daily_floorplan, wholesale_exit_price, days_already_held,
+    ))
+
+
+def _holding_irrational(d, lam, list_price, total_cost, daily_floorplan, wholesale_exit_price, days_already_held):
+    """True where, on day d from today, holding no longer beats exiting."""
+    floorplan_accumulated = daily_floorplan * (days_already_held + d)
+    net_retail_gross = (list_price - total_cost) - floorplan_accumulated
 
-    for d in range(1, 181):
-        total_day = days_already_held + d
-        floorplan_accumulated = daily_floorplan * total_day
-        net_retail_gross = potential_retail_gross - floorplan_accumulated
+    # Expected value of holding = P(sell on day d) * net_retail_gross
+    ev_hold = lam * np.exp(-lam * d) * net_retail_gross
 
-        # Expected value of holding = P(sell on day d) * net_retail_gross
-        p_sell_today = daily_sell_probability(lam, d)
-        ev_hold = p_sell_today * net_retail_gross
+    # Wholesale alternative (available anytime)
+    wholesale_gross = wholesale_exit_price - total_cost - floorplan_accumulated
 
-        # Cost of holding one more day
-        marginal_cost = daily_floorplan
+    # Inflection: EV of holding < marginal cost (one day of floorplan)
+    # OR wholesale beats retail EV
+    return (ev_hold < daily_floorplan) | (net_retail_gross < wholesale_gross)
 
-        # Wholesale alternative (available anytime)
-        wholesale_gross = wholesale_exit_price - total_cost - floorplan_accumulated
 
-        # Inflection: EV of holding < marginal cost OR wholesale beats retail EV
-        if ev_hold < marginal_cost or net_retail_gross < wholesale_gross:
-            return d
+def _inflection_days(lam, list_price, total_cost, daily_floorplan, wholesale_exit_price, days_already_held):
+    """
+    First day in 1-180 where holding turns irrational (180 if none).
+    Inputs may be scalars or (N,) arrays.
+
+    The condition is monotone in d: P(sell on day d) decays and net gross
+    only shrinks, so once EV drops below a day of carry it stays there,
+    and the wholesale comparison does not depend on d. That lets us
+    bisect for the first crossing — 8 evaluations instead of 180.
+    """
+    args = (lam, list_price, total_cost, daily_floorplan, wholesale_exit_price, days_already_held)
+    shape = np.broadcast(*args).shape
+    lo = np.ones(shape, dtype=np.int64)
+    hi = np.full(shape, 180, dtype=np.int64)
+
+    active = lo < hi
+    while active.any():
+        mid = (lo + hi) // 2
+        crossed = _holding_irrational(mid, *args)
+        hi = np.where(active & crossed, mid, hi)
+        lo = np.where(active & ~crossed, mid + 1, lo)
+        active = lo < hi
 
-    return 180  # never found — very unlikely
+    return lo  # 180 = never found — very unlikely
 
 
 # ---------------------------------------------------------------------------
 # 5) CARRY COST PROJECTIONS
 # ---------------------------------------------------------------------------
 def compute_carry_costs(daily_floorplan: float, days_already_held: int) -> Dict[str, float]:
-    return {
-        "daily_carry_cost": round(daily_floorplan, 2),
-        "carry_cost_30": round(daily_floorplan * (days_already_held + 30), 2),
-        "carry_cost_60": round(daily_floorplan * (days_already_held + 60), 2),
-        "carry_cost_90": round(daily_floorplan * (days_already_held + 90), 2),
-    }
+    fp_sched = _floorplan_schedule(np.float64(daily_floorplan), days_already_held)
+    return _scalars(_carry_costs_batch(daily_floorplan, fp_sched))
 
 
 def compute_margin_erosion(
     list_price: float, total_cost: float, daily_floorplan: float, days_already_held: int
 ) -> Dict[str, float]:
+    return _scalars(_margin_erosion_batch(
+        np.float64(list_price), total_cost, daily_floorplan, days_already_held,
+    ))
+
+
+def _carry_costs_batch(daily_floorplan, fp_sched) -> Dict[str, np.ndarray]:
+    """Carry cost columns from a _floorplan_schedule (scalar or (N,) rows)."""
+    carry = {"daily_carry_cost": np.round(daily_floorplan, 2)}
+    for t in (30, 60, 90):
+        carry[f"carry_cost_{t}"] = np.round(fp_sched[..., t - 1], 2)
+    return carry
+
+
+def _margin_erosion_batch(list_price, total_cost, daily_floorplan, days_already_held) -> Dict[str, np.ndarray]:
     current_gross = list_price - total_cost - (daily_floorplan * days_already_held)
     return {
-        "margin_erosion_30": round(current_gross - daily_floorplan * 30, 2),
-        "margin_erosion_60": round(current_gross - daily_floorplan * 60, 2),
-        "margin_erosion_90": round(current_gross - daily_floorplan * 90, 2),
+        f"margin_erosion_{t}": np.round(current_gross - daily_floorplan * t, 2)
+        for t in (30, 60, 90)
     }
   # ---------------------------------------------------------------------------
 # 6) PRICING STRATEGY RECOMMENDATION
 # ---------------------------------------------------------------------------
+class PriceElasticity(NamedTuple):
+    elasticity: str  # low / medium / high
+    reason: str
+
+
 def compute_price_elasticity(
     comp_median_price: Optional[float],
     list_price: float,
     demand_score: float,
     supply_count: int,
-) -> Dict[str, Any]:
+) -> PriceElasticity:
     """
     Assess how sensitive this vehicle's sell probability is to price changes.
     Returns elasticity level + reason.
     """
     if comp_median_price is None or comp_median_price == 0:
-        return {"elasticity": "medium", "reason": "Insufficient comp data to assess elasticity precisely."}
+        return PriceElasticity("medium", "Insufficient comp data to assess elasticity precisely.")
 
     price_ratio = list_price / comp_median_price
     reasons = []
@@ -245,7 +362,7 @@ def compute_price_elasticity(
         reasons.append(f"Moderate market conditions. Supply: {supply_count}, demand score: {demand_score}.")
         elasticity = "medium"
 
-    return {"elasticity": elasticity, "reason": " ".join(reasons)}
+    return PriceElasticity(elasticity, " ".join(reasons))
 
 
 def recommend_pricing(
@@ -343,10 +460,12 @@ def recommend_exit_path(
     p60: float,
     lam: float,
     comp_median_price: Optional[float],
+    include_reason: bool = True,
 ) -> Dict[str, Any]:
     """
     Compare retail vs wholesale-auction vs dealer trade.
-    Pick the risk-adjusted best path.
+    Pick the risk-adjusted best path. With include_reason=False the
+    exit_reason text is skipped (None) and only the numbers are returned.
     """
     current_carry = daily_floorplan * days_in_inventory
 
@@ -399,27 +518,42 @@ def recommend_exit_path(
     best = max(options, key=lambda k: options[k]["risk_adjusted"])
     chosen = options[best]
 
-    # Explain why
+    return {
+        "optimal_exit": best,
+        "exit_expected_gross": chosen["risk_adjusted"],
+        "exit_expected_days": chosen["days"],
+        "exit_reason": format_exit_reason(
+            best, chosen["risk_adjusted"], chosen["days"], p30, p60,
+            retail_risk_adjusted > wholesale_risk_adjusted * 1.3, wholesale_days,
+        ) if include_reason else None,
+    }
+
+
+def format_exit_reason(
+    best: str,
+    risk_adjusted: float,
+    days: float,
+    p30: float,
+    p60: float,
+    retail_far_ahead: bool,
+    wholesale_days: int = 7,
+) -> str:
+    """Human-readable explanation for recommend_exit_path's pick."""
     reasons = []
     if best == "retail":
-        reasons.append(f"Retail yields highest risk-adjusted return (${chosen['risk_adjusted']:,.0f}).")
-        reasons.append(f"Expected {chosen['days']:.0f} days to sale with {p60:.0%} probability by day 60.")
-        if retail_risk_adjusted > wholesale_risk_adjusted * 1.3:
+        reasons.append(f"Retail yields highest risk-adjusted return (${risk_adjusted:,.0f}).")
+        reasons.append(f"Expected {days:.0f} days to sale with {p60:.0%} probability by day 60.")
+        if retail_far_ahead:
             reasons.append("Retail significantly outperforms wholesale on expected value.")
     elif best == "wholesale_auction":
-        reasons.append(f"Wholesale is the strongest exit at ${chosen['risk_adjusted']:,.0f} risk-adjusted.")
+        reasons.append(f"Wholesale is the strongest exit at ${risk_adjusted:,.0f} risk-adjusted.")
         reasons.append(f"Retail probability too low (p30={p30:.0%}) to justify continued holding cost.")
         reasons.append(f"Exit in ~{wholesale_days} days eliminates further floorplan bleed.")
     else:
-        reasons.append(f"Dealer trade offers a slight premium over wholesale (${chosen['risk_adjusted']:,.0f}).")
+        reasons.append(f"Dealer trade offers a slight premium over wholesale (${risk_adjusted:,.0f}).")
         reasons.append("Retail risk is elevated but wholesale feels premature.")
 
-    return {
-        "optimal_exit": best,
-        "exit_expected_gross": chosen["risk_adjusted"],
-        "exit_expected_days": chosen["days"],
-        "exit_reason": " ".join(reasons),
-    }
+    return " ".join(reasons)
 
 
 # ---------------------------------------------------------------------------
@@ -528,99 +662,189 @@ def run_full_analysis(
     vehicle: Any,
     comp_summary: Optional[Any] = None,
     signals: Optional[Any] = None,
+    include_curve: bool = True,
+    include_narratives: bool = True,
 ) -> Dict[str, Any]:
     """
     Master function. Takes a Vehicle ORM object + optional CompSummary + Signals.
     Returns the complete analysis dict ready to store in AnalysisReport.
+    Results are memoized on the extracted scalar inputs, so repeat calls for
+    an unchanged vehicle skip the curve + inflection math entirely. Each call
+    gets its own copy of the report, nested lists and curve included, so it
+    is safe to modify before persisting.
+    Pass include_curve=False for summary views — daily_curve comes back None
+    and the 90-day curve is never built. Likewise include_narratives=False
+    leaves exit_reason / action_plan as None and skips formatting them.
     """
-    total_cost = (vehicle.acquisition_cost or 0) + (vehicle.recon_cost or 0)
-    daily_fp = total_cost * ((vehicle.floorplan_rate_apr or DEFAULT_FLOORPLAN_APR) / 100) / 365
-    days = vehicle.days_in_inventory or 0
+    inputs = _analysis_inputs(vehicle, comp_summary, signals)
+    if include_curve:
+        cached = _cached_analysis_with_curve(include_narratives, **inputs)
+    else:
+        cached = _cached_analysis_summary(include_narratives, **inputs)
+    return _copy_analysis(cached)
+
+
+# Curve-bearing reports hold 450 floats each, so they get the smaller cache
+@functools.lru_cache(maxsize=256)
+def _cached_analysis_with_curve(include_narratives: bool, **inputs: Any) -> Dict[str, Any]:
+    return _analyze_inputs([inputs], True, include_narratives)[0]
+
+
+@functools.lru_cache(maxsize=4096)
+def _cached_analysis_summary(include_narratives: bool, **inputs: Any) -> Dict[str, Any]:
+    return _analyze_inputs([inputs], False, include_narratives)[0]
+
+
+def _copy_analysis(report: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a cached report that shares no mutable containers with it."""
+    out = {k: list(v) if isinstance(v, list) else v for k, v in report.items()}
+    if out.get("daily_curve") is not None:
+        out["daily_curve"] = {k: list(v) for k, v in out["daily_curve"].items()}
+    return out
+
 
-    # Extract comp data
+def _analysis_inputs(vehicle: Any, comp_summary: Optional[Any], signals: Optional[Any]) -> Dict[str, Any]:
+    """Pull the scalar inputs for one vehicle off its ORM objects."""
+    total_cost = (vehicle.acquisition_cost or 0) + (vehicle.recon_cost or 0)
     median_price = comp_summary.median_price if comp_summary and comp_summary.median_price else None
-    median_days = comp_summary.median_days_to_sale if comp_summary and comp_summary.median_days_to_sale else DEFAULT_MEDIAN_DAYS_TO_SALE
-    demand_score = comp_summary.demand_score if comp_summary else DEFAULT_DEMAND_SCORE
-    supply_count = comp_summary.supply_count if comp_summary else 0
-    comp_count = (comp_summary.auto_count or 0) + (comp_summary.manual_count or 0) if comp_summary else 0
 
-    # Extract signals
-    v7 = signals.views_last_7 if signals else 0
-    l7 = signals.leads_last_7 if signals else 0
+    return {
+        "list_price": vehicle.list_price,
+        "total_cost": total_cost,
+        "daily_fp": total_cost * ((vehicle.floorplan_rate_apr or DEFAULT_FLOORPLAN_APR) / 100) / 365,
+        "days": vehicle.days_in_inventory or 0,
+        "wholesale_exit_price": vehicle.wholesale_exit_price or 0,
+        "min_acceptable_margin": vehicle.min_acceptable_margin or 500,
+        # Comp data
+        "median_price": median_price,
+        "median_days": comp_summary.median_days_to_sale if comp_summary and comp_summary.median_days_to_sale else DEFAULT_MEDIAN_DAYS_TO_SALE,
+        "demand_score": comp_summary.demand_score if comp_summary else DEFAULT_DEMAND_SCORE,
+        "supply_count": comp_summary.supply_count if comp_summary else 0,
+        "comp_count": (comp_summary.auto_count or 0) + (comp_summary.manual_count or 0) if comp_summary else 0,
+        # Signals
+        "v7": signals.views_last_7 if signals else 0,
+        "l7": signals.leads_last_7 if signals else 0,
+    }
+
 
-    price_vs_market = (vehicle.list_price - median_price) if median_price else 0
+def run_full_analysis_batch(
+    vehicles: List[Any],
+    comp_summaries: Optional[List[Optional[Any]]] = None,
+    signals: Optional[List[Optional[Any]]] = None,
+    include_curve: bool = True,
+    include_narratives: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    run_full_analysis over N vehicles at once. comp_summaries / signals are
+    aligned with vehicles (None entries allowed). Lambda, probabilities,
+    curve, inflection and carry math run as (N,) / (N, 90) arrays; the
+    pricing / exit / narrative pieces are still built per vehicle.
+    """
+    n = len(vehicles)
+    comp_summaries = comp_summaries or [None] * n
+    signals = signals or [None] * n
+    inputs = [_analysis_inputs(v, cs, sig) for v, cs, sig in zip(vehicles, comp_summaries, signals)]
+
+    # Blocks keep the (N, 90) temporaries small at portfolio scale
+    results: List[Dict[str, Any]] = []
+    for start in range(0, n, _BATCH_BLOCK_SIZE):
+        results.extend(_analyze_inputs(
+            inputs[start:start + _BATCH_BLOCK_SIZE], include_curve, include_narratives,
+        ))
+    return results
+
+
+def _analyze_inputs(
+    inputs: List[Dict[str, Any]],
+    include_curve: bool = True,
+    include_narratives: bool = True,
+) -> List[Dict[str, Any]]:
+    """Vectorized core of run_full_analysis_batch over _analysis_inputs dicts."""
+    def col(key: str) -> np.ndarray:
+        return np.array([float(x[key]) for x in inputs], dtype=np.float64)
+
+    list_price, total_cost, daily_fp, days = col("list_price"), col("total_cost"), col("daily_fp"), col("days")
+    wholesale = col("wholesale_exit_price")
+    price_vs_market = np.array(
+        [x["list_price"] - x["median_price"] if x["median_price"] else 0 for x in inputs], dtype=np.float64,
+    )
 
     # 1) Lambda
-    lam = compute_lambda(
-        median_days_to_sale=median_days,
-        demand_score=demand_score,
-        price_vs_market=price_vs_market,
-        days_already_held=days,
-        views_last_7=v7,
-        leads_last_7=l7,
+    lam = _compute_lambda_batch(
+        col("median_days"), col("demand_score"), price_vs_market, days, col("v7"), col("l7"),
     )
 
     # 2) Probabilities
-    probs = compute_probabilities(lam)
-
-    # 3) Curve
-    curve = generate_daily_curve(lam, total_cost, vehicle.list_price, daily_fp, days)
+    probs = _probabilities_batch(lam)
 
     # 4) Classification
-    aging_class = classify_aging(days, probs["p30"])
+    aging = classify_aging_batch(days, probs["p30"]).tolist()
+    probs = {k: v.tolist() for k, v in probs.items()}
 
-    # 5) Inflection
-    inflection = compute_inflection_day(
-        lam, vehicle.list_price, total_cost, daily_fp,
-        vehicle.wholesale_exit_price or 0, days
-    )
+    # 3) Curve — (N, 90)
+    fp_sched = _floorplan_schedule(daily_fp[:, None], days[:, None])  # (N, 90)
+    curve_cols = [c.tolist() for c in _curve_columns(lam[:, None], fp_sched)] if include_curve else None
+
+    # 5) Inflection — (N,)
+    inflection = _inflection_days(lam, list_price, total_cost, daily_fp, wholesale, days).tolist()
 
     # 6) Carry costs + erosion
-    carry = compute_carry_costs(daily_fp, days)
-    erosion = compute_margin_erosion(vehicle.list_price, total_cost, daily_fp, days)
-
-    # 7) Pricing
-    pricing = recommend_pricing(
-        vehicle.list_price, total_cost, median_price, days,
-        probs["p30"], demand_score, supply_count,
-        vehicle.min_acceptable_margin or 500, daily_fp,
-    )
+    carry = {k: v.tolist() for k, v in _carry_costs_batch(daily_fp, fp_sched).items()}
+    erosion = {k: v.tolist() for k, v in _margin_erosion_batch(list_price, total_cost, daily_fp, days).items()}
+
+    lam = lam.tolist()
+    results = []
+    for i, x in enumerate(inputs):
+        p30, p60 = probs["p30"][i], probs["p60"][i]
+        days_i = x["days"]
+        median_price = x["median_price"]
+
+        aging_class = aging[i]
+
+        # 7) Pricing
+        pricing = recommend_pricing(
+            x["list_price"], x["total_cost"], median_price, days_i,
+            p30, x["demand_score"], x["supply_count"],
+            x["min_acceptable_margin"], x["daily_fp"],
+        )
 
-    # 8) Elasticity
-    elast = compute_price_elasticity(median_price, vehicle.list_price, demand_score, supply_count)
+        # 8) Elasticity
+        elast = compute_price_elasticity(median_price, x["list_price"], x["demand_score"], x["supply_count"])
 
-    # 9) Exit path
-    exit_rec = recommend_exit_path(
-        vehicle.list_price, total_cost, vehicle.wholesale_exit_price or 0,
-        daily_fp, days, probs["p30"], probs["p60"], lam, median_price,
-    )
+        # 9) Exit path
+        exit_rec = recommend_exit_path(
+            x["list_price"], x["total_cost"], x["wholesale_exit_price"],
+            x["daily_fp"], days_i, p30, p60, lam[i], median_price, include_narratives,
+        )
 
-    # 10) Action plan
-    actions = generate_action_plan(
-        days, aging_class, pricing["price_action"], pricing["price_change_amount"],
-        exit_rec["optimal_exit"], probs["p30"], v7, l7,
-        vehicle.list_price, median_price,
-    )
+        # 10) Action plan
+        actions = generate_action_plan(
+            days_i, aging_class, pricing["price_action"], pricing["price_change_amount"],
+            exit_rec["optimal_exit"], p30, x["v7"], x["l7"],
+            x["list_price"], median_price,
+        ) if include_narratives else None
 
-    # 11) Risk
-    risk = assess_risk_and_confidence(
-        days, comp_count, demand_score, probs["p30"], aging_class, pricing["price_action"],
-    )
+        # 11) Risk
+        risk = assess_risk_and_confidence(
+            days_i, x["comp_count"], x["demand_score"], p30, aging_class, pricing["price_action"],
+        )
 
-    return {
-        **probs,
-        "aging_class": aging_class,
-        "inflection_day": inflection,
-        **carry,
-        **erosion,
-        **pricing,
-        "price_elasticity": elast["elasticity"],
-        "elasticity_reason": elast["reason"],
-        **exit_rec,
-        "action_plan": actions,
-        **risk,
-        "daily_curve": curve,
-    }
+        results.append({
+            **{k: v[i] for k, v in probs.items()},
+            "aging_class": aging_class,
+            "inflection_day": inflection[i],
+            **{k: v[i] for k, v in carry.items()},
+            **{k: v[i] for k, v in erosion.items()},
+            **pricing,
+            "price_elasticity": elast.elasticity,
+            "elasticity_reason": elast.reason,
+            **exit_rec,
+            "action_plan": actions,
+            **risk,
+            "daily_curve": _curve_dict(*(c[i] for c in curve_cols)) if include_curve else None,
+        })
+
+    return results
 
 
 # ---------------------------------------------------------------------------
@@ -634,9 +858,9 @@ def build_comp_summary(
     Takes lists of Comp ORM objects, builds summary stats.
     Handles discrepancy detection between auto and manual sources.
     """
-    all_comps = auto_comps + manual_comps
+    supply_count = len(auto_comps) + len(manual_comps)
 
-    if not all_comps:
+    if not supply_count:
         return {
             "auto_count": 0, "manual_count": 0,
             "median_price": None, "mean_price": None,
@@ -648,23 +872,35 @@ def build_comp_summary(
             "weighted_source": None, "weight_reason": None,
         }
 
-    # Prices
-    auto_prices = [c.price for c in auto_comps if c.price]
-    manual_prices = [c.price for c in manual_comps if c.price]
-    all_prices = [c.price for c in all_comps if c.price]
-
-    # Days on market
-    all_dom = [c.days_on_market for c in all_comps if c.days_on_market is not None]
-
-    median_price = statistics.median(all_prices) if all_prices else None
-    mean_price = statistics.mean(all_prices) if all_prices else None
-    low_price = min(all_prices) if all_prices else None
-    high_price = max(all_prices) if all_prices else None
-    median_dom = statistics.median(all_dom) if all_dom else None
+    # Prices, days on market and sold count in one pass over the comps
+    auto_price_list: List[float] = []
+    manual_price_list: List[float] = []
+    dom_list: List[float] = []
+    sold_count = 0
+    for prices, comps in ((auto_price_list, auto_comps), (manual_price_list, manual_comps)):
+        for c in comps:
+            if c.price:
+                prices.append(c.price)
+            if c.days_on_market is not None:
+                dom_list.append(c.days_on_market)
+            if c.listing_status == "sold":
+                sold_count += 1
+
+    auto_prices = np.array(auto_price_list, dtype=np.float64)
+    manual_prices = np.array(manual_price_list, dtype=np.float64)
+    all_prices = np.concatenate((auto_prices, manual_prices))
+    all_dom = np.array(dom_list, dtype=np.float64)
+
+    if all_prices.size:
+        median_price = float(np.median(all_prices))
+        mean_price = float(all_prices.mean())
+        low_price = float(all_prices.min())
+        high_price = float(all_prices.max())
+    else:
+        median_price = mean_price = low_price = high_price = None
+    median_dom = float(np.median(all_dom)) if all_dom.size else None
 
     # Supply vs demand heuristic
-    supply_count = len(all_comps)
-    sold_count = len([c for c in all_comps if c.listing_status == "sold"])
     if supply_count > 0:
         sold_ratio = sold_count / supply_count
     else:
@@ -686,9 +922,9 @@ def build_comp_summary(
     weighted_source = None
     weight_reason = None
 
-    if auto_prices and manual_prices:
-        auto_median = statistics.median(auto_prices)
-        manual_median = statistics.median(manual_prices)
+    if auto_prices.size and manual_prices.size:
+        auto_median = float(np.median(auto_prices))
+        manual_median = float(np.median(manual_prices))
         diff_pct = abs(auto_median - manual_median) / auto_median * 100 if auto_median else 0
 
         if diff_pct > 8:
@@ -735,6 +971,21 @@ def build_comp_summary(
 # ---------------------------------------------------------------------------
 # 12) WATERFALL PLAN GENERATOR
 # ---------------------------------------------------------------------------
+def _rule_trigger_day(rule: Dict) -> int:
+    return rule.get("trigger_day", 0)
+
+
+def sort_waterfall_rules(rules: List[Dict]) -> List[Dict]:
+    """
+    Rules ordered by trigger_day. Settings are stored pre-sorted, so this is
+    normally a single O(R) check that hands back the same list.
+    """
+    days = [_rule_trigger_day(r) for r in rules]
+    if all(a <= b for a, b in zip(days, days[1:])):
+        return rules
+    return sorted(rules, key=_rule_trigger_day)
+
+
 def generate_waterfall_plan(
     vehicle: Any,
     rules: List[Dict],
@@ -756,7 +1007,7 @@ def generate_waterfall_plan(
     steps = []
     running_price = current_price
 
-    for i, rule in enumerate(sorted(rules, key=lambda r: r.get("trigger_day", 0))):
+    for i, rule in enumerate(sort_waterfall_rules(rules)):
         trigger_day = rule.get("trigger_day", 30)
         reduction_pct = rule.get("reduction_pct", 5)
         margin_floor = rule.get("min_margin_floor", 0)
@@ -815,6 +1066,59 @@ def generate_waterfall_plan(
 # ---------------------------------------------------------------------------
 # 13) ALARM GENERATOR
 # ---------------------------------------------------------------------------
+_ALARM_FIELDS = operator.attrgetter(
+    "acquisition_cost", "recon_cost", "floorplan_rate_apr", "days_in_inventory", "list_price",
+)
+
+# Executive-summary templates, parsed once
+_ALARM_SUMMARY_HEAD = (
+    "{0} active units. Total daily floorplan burn: ${1:,.2f}. "
+    "Projected 30-day burn: ${2:,.0f}. 60-day burn: ${3:,.0f}."
+)
+_ALARM_SUMMARY_UNDERWATER = "⚠ {0} vehicle(s) are underwater (negative net gross after carry)."
+_ALARM_SUMMARY_TOP_BURNER = "Top burner: {year} {make} {model} (${daily_cost}/day, {days} days)."
+_ALARM_SUMMARY_CROSSING = "{0} vehicle(s) just crossed the {1}-day threshold."
+
+
+def _vehicles_to_soa(vehicles: List[Any]) -> Dict[str, np.ndarray]:
+    """
+    Structure-of-arrays view of the numeric Vehicle fields the alarm needs,
+    with the same `or` defaults the per-vehicle math applies. Shape (N,).
+    Each vehicle is read with one attrgetter call; the None / zero-APR
+    defaults are applied to the whole column afterwards.
+    """
+    rows = np.array(list(map(_ALARM_FIELDS, vehicles)), dtype=object).reshape(-1, 5)
+    rows[np.equal(rows, None)] = 0
+    acq, recon, apr, days, price = np.ascontiguousarray(rows.T, dtype=np.float64)
+    apr[apr == 0] = DEFAULT_FLOORPLAN_APR
+
+    return {
+        "acquisition_cost": acq,
+        "recon_cost": recon,
+        "floorplan_rate_apr": apr,
+        "days_in_inventory": days,
+        "list_price": price,
+    }
+
+
+def _alarm_kernel(
+    acquisition_cost: np.ndarray,
+    recon_cost: np.ndarray,
+    floorplan_rate_apr: np.ndarray,
+    days_in_inventory: np.ndarray,
+    list_price: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, float]:
+    """
+    Numeric core of generate_alarm — arrays in, arrays out, no dicts.
+    Returns (daily, total_carry, net_gross, underwater_mask, total_burn).
+    """
+    tc = acquisition_cost + recon_cost
+    daily = tc * (floorplan_rate_apr / 100) / 365
+    total_carry = daily * days_in_inventory
+    net_gross = list_price - tc - total_carry
+    return daily, total_carry, net_gross, net_gross < 0, float(daily.sum())
+
+
 def generate_alarm(
     vehicles: List[Any],
     thresholds: List[int],
@@ -826,59 +1130,62 @@ def generate_alarm(
     if not thresholds:
         thresholds = [30, 45, 60, 75]
 
-    thresholds = sorted(thresholds)
-    total_burn = 0
-    burner_list = []
-    threshold_crossings = {str(t): [] for t in thresholds}
-    underwater = []
-
-    for v in vehicles:
-        tc = (v.acquisition_cost or 0) + (v.recon_cost or 0)
-        daily = tc * ((v.floorplan_rate_apr or DEFAULT_FLOORPLAN_APR) / 100) / 365
-        days = v.days_in_inventory or 0
-        total_carry = daily * days
-        net_gross = (v.list_price or 0) - tc - total_carry
-
-        total_burn += daily
-
-        burner_list.append({
-            "vehicle_id": v.id,
-            "vin": v.vin,
-            "year": v.year,
-            "make": v.make,
-            "model": v.model,
-            "daily_cost": round(daily, 2),
-            "days": days,
-            "total_carry": round(total_carry, 2),
-            "net_gross": round(net_gross, 2),
-        })
+    thresholds = sorted(set(thresholds))
+    threshold_keys = [str(t) for t in thresholds]
+
+    # Carry math for the whole lot at once
+    soa = _vehicles_to_soa(vehicles)
+    daily_arr, total_carry_arr, net_gross_arr, underwater_mask, total_burn = _alarm_kernel(**soa)
+
+    # Threshold crossings (newly crossing = days equals threshold, or one past it)
+    # as one (N, T) comparison instead of a branch per vehicle per threshold
+    days_col = soa["days_in_inventory"][:, None]
+    thr = np.asarray(thresholds, dtype=np.float64)
+    crossing = (days_col >= thr) & (days_col <= thr + 1)
+    threshold_crossings = {
+        key: [
+            {"vehicle_id": vehicles[i].id, "vin": vehicles[i].vin, "days": vehicles[i].days_in_inventory or 0}
+            for i in np.flatnonzero(crossing[:, j]).tolist()
+        ]
+        for j, key in enumerate(threshold_keys)
+    }
 
-        # Threshold crossings (newly crossing = days equals threshold)
-        for t in thresholds:
-            if days == t or (days > t and days <= t + 1):
-                threshold_crossings[str(t)].append({
-                    "vehicle_id": v.id,
-                    "vin": v.vin,
-                    "days": days,
-                })
-            elif days > t:
-                # Currently beyond — we track separately in the payload
-                pass
-
-        if net_gross < 0:
-            underwater.append({
-                "vehicle_id": v.id,
-                "vin": v.vin,
-                "year": v.year,
-                "make": v.make,
-                "model": v.model,
-                "net_gross": round(net_gross, 2),
-                "days": days,
-            })
-
-    # Sort burners
-    burner_list.sort(key=lambda x: x["daily_cost"], reverse=True)
-    top_3 = burner_list[:3]
+    # Top burners — only vehicles within a cent of the 3rd-highest raw burn
+    # can make the cut on rounded daily_cost; dicts are built for those alone
+    # and nlargest keeps the old sort's order for ties
+    if len(vehicles) > 3:
+        third = float(np.partition(daily_arr, -3)[-3])
+        candidates = np.flatnonzero(daily_arr >= third - 0.01).tolist()
+    else:
+        candidates = range(len(vehicles))
+    top_idx = heapq.nlargest(3, candidates, key=lambda i: round(float(daily_arr[i]), 2))
+    top_3 = [
+        {
+            "vehicle_id": vehicles[i].id,
+            "vin": vehicles[i].vin,
+            "year": vehicles[i].year,
+            "make": vehicles[i].make,
+            "model": vehicles[i].model,
+            "daily_cost": round(float(daily_arr[i]), 2),
+            "days": vehicles[i].days_in_inventory or 0,
+            "total_carry": round(float(total_carry_arr[i]), 2),
+            "net_gross": round(float(net_gross_arr[i]), 2),
+        }
+        for i in top_idx
+    ]
+
+    underwater = [
+        {
+            "vehicle_id": vehicles[i].id,
+            "vin": vehicles[i].vin,
+            "year": vehicles[i].year,
+            "make": vehicles[i].make,
+            "model": vehicles[i].model,
+            "net_gross": round(float(net_gross_arr[i]), 2),
+            "days": vehicles[i].days_in_inventory or 0,
+        }
+        for i in np.flatnonzero(underwater_mask).tolist()
+    ]
 
     # Projections
     projected_30 = round(total_burn * 30, 2)
@@ -887,22 +1194,16 @@ def generate_alarm(
     # Executive summary
     total_units = len(vehicles)
     uw_count = len(underwater)
-    summary_parts = [
-        f"{total_units} active units. Total daily floorplan burn: ${total_burn:,.2f}.",
-        f"Projected 30-day burn: ${projected_30:,.0f}. 60-day burn: ${projected_60:,.0f}.",
-    ]
+    summary_parts = [_ALARM_SUMMARY_HEAD.format(total_units, total_burn, projected_30, projected_60)]
     if uw_count > 0:
-        summary_parts.append(f"⚠ {uw_count} vehicle(s) are underwater (negative net gross after carry).")
+        summary_parts.append(_ALARM_SUMMARY_UNDERWATER.format(uw_count))
     if top_3:
-        summary_parts.append(
-            f"Top burner: {top_3[0]['year']} {top_3[0]['make']} {top_3[0]['model']} "
-            f"(${top_3[0]['daily_cost']}/day, {top_3[0]['days']} days)."
-        )
+        summary_parts.append(_ALARM_SUMMARY_TOP_BURNER.format_map(top_3[0]))
 
-    for t in thresholds:
-        crossings = threshold_crossings[str(t)]
+    for key, t in zip(threshold_keys, thresholds):
+        crossings = threshold_crossings[key]
         if crossings:
-            summary_parts.append(f"{len(crossings)} vehicle(s) just crossed the {t}-day threshold.")
+            summary_parts.append(_ALARM_SUMMARY_CROSSING.format(len(crossings), t))
 
     return {
         "dealership_id": dealership_id,
@@ -1,27 +1,40 @@
 # backend/main.py — FastAPI App + All Routes (Part 1 of 3)
 
+import asyncio
 import httpx
 import csv
 import io
+import time
+import uuid
+import zlib
 from datetime import date, datetime
-from typing import Optional, List
+from typing import Dict, Optional, List, Tuple
 
-from fastapi import FastAPI, Depends, HTTPException, Header, Query, UploadFile, File
+import numpy as np
+
+from fastapi import FastAPI, BackgroundTasks, Depends, HTTPException, Header, Query, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from fastapi.responses import JSONResponse, Response
+from pydantic import TypeAdapter
+from sqlalchemy import and_, func, insert, lambda_stmt, select, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session, selectinload
 
 from models import (
-    init_db, get_db, ALLOWED_ORIGINS, NHTSA_API_URL,
+    init_db, get_db, SessionLocal, ALLOWED_ORIGINS, NHTSA_API_URL,
+    DEFAULT_ALARM_THRESHOLDS, DEFAULT_WATERFALL_RULES,
     Dealership, User, Vehicle, VehicleSignals, Comp, CompSummary,
     AnalysisReport, FloorplanAlarm, AlarmConfig, PricingWaterfallSettings,
-    PriceEventLog, VehicleStatus, CompSource,
+    PriceEventLog, VinDecodeCache, VehicleStatus, CompSource,
 )
 from schemas import (
     DealershipCreate, DealershipOut, UserCreate, UserOut,
     VinAddRequest, VehicleUpdate, VehicleOut,
     SignalsUpdate, SignalsOut,
     CompManualAdd, CompOut, CompSummaryOut, CompSourceEnum,
-    AnalysisReportOut, VehicleInsight,
+    AnalysisReportOut, AnalysisReportSummaryOut, VehicleInsight,
     AlarmOut, AlarmConfigUpdate, AlarmConfigOut,
     WaterfallSettingsUpdate, WaterfallSettingsOut,
     WaterfallPlanOut, WaterfallStepOut,
@@ -46,8 +59,12 @@ app.add_middleware(
 @app.on_event("startup")
 def startup():
     init_db()
+    # Shared client so NHTSA lookups reuse pooled keep-alive connections
+    app.state.http = httpx.AsyncClient(
+        timeout=10,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=15),
+    )
     # Seed a default dealership for dev convenience
-    from models import SessionLocal
     db = SessionLocal()
     if not db.query(Dealership).first():
         demo = Dealership(name="Demo Dealership", timezone="America/Chicago")
@@ -55,22 +72,22 @@ def startup():
         db.commit()
         db.refresh(demo)
         # Default alarm config
-        db.add(AlarmConfig(dealership_id=demo.id, thresholds=[30, 45, 60, 75]))
+        db.add(AlarmConfig(dealership_id=demo.id, thresholds=list(DEFAULT_ALARM_THRESHOLDS)))
         # Default waterfall settings
         db.add(PricingWaterfallSettings(
             dealership_id=demo.id,
-            rules=[
-                {"trigger_day": 15, "reduction_pct": 3, "min_margin_floor": 1500},
-                {"trigger_day": 30, "reduction_pct": 5, "min_margin_floor": 1000},
-                {"trigger_day": 45, "reduction_pct": 8, "min_margin_floor": 500},
-                {"trigger_day": 60, "reduction_pct": 12, "min_margin_floor": 0},
-            ],
+            rules=list(DEFAULT_WATERFALL_RULES),
             price_floor_policy="total_cost",
         ))
         db.commit()
     db.close()
 
 
+@app.on_event("shutdown")
+async def shutdown():
+    await app.state.http.aclose()
+
+
 # ---------------------------------------------------------------------------
 # HELPER: Get dealership_id from header
 # ---------------------------------------------------------------------------
@@ -81,8 +98,14 @@ def get_dealership_id(x_dealership_id: int = Header(default=1)) -> int:
 # ---------------------------------------------------------------------------
 # HEALTH
 # ---------------------------------------------------------------------------
-@app.get("/api/vehicle/{vehicle_id}", )
-def health():
+@app.get("/api/health", )
+def health(db: Session = Depends(get_db)):
+    # One trivial round-trip so a dead database shows up here, not on the
+    # first real request
+    try:
+        db.execute(select(1))
+    except SQLAlchemyError:
+        raise HTTPException(503, "Database unavailable.")
     return {"status": "ok", "app": "30-60-90", "version": "1.0.0"}
 
 
@@ -96,16 +119,8 @@ def create_dealership(payload: DealershipCreate, db: Session = Depends(get_db)):
     db.commit()
     db.refresh(d)
     # Create default configs
-    db.add(AlarmConfig(dealership_id=d.id, thresholds=[30, 45, 60, 75]))
-    db.add(PricingWaterfallSettings(
-        dealership_id=d.id,
-        rules=[
-            {"trigger_day": 15, "reduction_pct": 3, "min_margin_floor": 1500},
-            {"trigger_day": 30, "reduction_pct": 5, "min_margin_floor": 1000},
-            {"trigger_day": 45, "reduction_pct": 8, "min_margin_floor": 500},
-            {"trigger_day": 60, "reduction_pct": 12, "min_margin_floor": 0},
-        ],
-    ))
+    db.add(AlarmConfig(dealership_id=d.id, thresholds=list(DEFAULT_ALARM_THRESHOLDS)))
+    db.add(PricingWaterfallSettings(dealership_id=d.id, rules=list(DEFAULT_WATERFALL_RULES)))
     db.commit()
     return d
 
@@ -138,23 +153,22 @@ async def decode_vin(vin: str) -> dict:
     """Call NHTSA vPIC API to decode VIN."""
     url = f"{NHTSA_API_URL}/DecodeVinValues/{vin}?format=json"
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            resp = await client.get(url)
-            resp.raise_for_status()
-            data = resp.json()
-            results = data.get("Results", [{}])[0]
-            return {
-                "year": int(results.get("ModelYear") or 0) or None,
-                "make": results.get("Make") or None,
-                "model": results.get("Model") or None,
-                "trim": results.get("Trim") or None,
-                "body_style": results.get("BodyClass") or None,
-                "engine": " ".join(filter(None, [
-                    results.get("EngineConfiguration"),
-                    results.get("DisplacementL"),
-                    results.get("FuelTypePrimary"),
-                ])) or None,
-            }
+        resp = await app.state.http.get(url)
+        resp.raise_for_status()
+        data = resp.json()
+        results = data.get("Results", [{}])[0]
+        return {
+            "year": int(results.get("ModelYear") or 0) or None,
+            "make": results.get("Make") or None,
+            "model": results.get("Model") or None,
+            "trim": results.get("Trim") or None,
+            "body_style": results.get("BodyClass") or None,
+            "engine": " ".join(filter(None, [
+                results.get("EngineConfiguration"),
+                results.get("DisplacementL"),
+                results.get("FuelTypePrimary"),
+            ])) or None,
+        }
     except Exception:
         return {}
 
@@ -162,27 +176,112 @@ async def decode_vin(vin: str) -> dict:
 # ---------------------------------------------------------------------------
 # VEHICLE ROUTES
 # ---------------------------------------------------------------------------
-@app.post("/api/vehicles/from-vin", )
+@app.post("/api/vehicles/from-vin", response_model=VehicleOut)
 async def add_vehicle_from_vin(
     payload: VinAddRequest,
     db: Session = Depends(get_db),
     dealership_id: int = Depends(get_dealership_id),
 ):
+    # Sync session work goes to the threadpool so it doesn't block the event
+    # loop between awaits; only the NHTSA call runs on the loop itself
+
     # Check for duplicate VIN at this dealership
-    existing = db.query(Vehicle).filter(
+    existing = await run_in_threadpool(_find_active_vehicle_by_vin, db, dealership_id, payload.vin)
+    if existing:
+        raise HTTPException(400, f"Active vehicle with VIN {payload.vin} already exists (id={existing.id}).")
+
+    # Decode VIN — shared cache first, NHTSA only on a miss
+    decoded = await _decode_vins_cached(db, [payload.vin])
+
+    return await run_in_threadpool(_create_vehicle, db, dealership_id, payload, decoded[payload.vin])
+
+
+@app.post("/api/vehicles/from-vins", response_model=List[VehicleOut])
+async def add_vehicles_from_vins(
+    payload: List[VinAddRequest],
+    db: Session = Depends(get_db),
+    dealership_id: int = Depends(get_dealership_id),
+):
+    """Bulk add — decodes every VIN concurrently, then inserts in one transaction."""
+    if not payload:
+        return []
+
+    vins = [p.vin for p in payload]
+    if len(set(vins)) != len(vins):
+        raise HTTPException(400, "Duplicate VINs in request.")
+
+    existing = await run_in_threadpool(_find_active_vehicles_by_vin, db, dealership_id, vins)
+    if existing:
+        taken = ", ".join(f"{v.vin} (id={v.id})" for v in existing)
+        raise HTTPException(400, f"Active vehicles already exist for: {taken}.")
+
+    decoded = await _decode_vins_cached(db, vins)
+
+    return await run_in_threadpool(_create_vehicles, db, dealership_id, payload, decoded)
+
+
+_VIN_DECODE_FIELDS = ("year", "make", "model", "trim", "body_style", "engine")
+_VIN_DECODE_CONCURRENCY = 20  # in-flight NHTSA requests per bulk add
+
+
+async def _decode_vins_cached(db: Session, vins: List[str]) -> dict:
+    """Decode each VIN, serving from the shared cache and fetching misses concurrently."""
+    decoded = await run_in_threadpool(_get_cached_vin_decodes, db, vins)
+    misses = [vin for vin in vins if vin not in decoded]
+    if not misses:
+        return decoded
+
+    sem = asyncio.Semaphore(_VIN_DECODE_CONCURRENCY)
+
+    async def fetch(vin: str) -> dict:
+        async with sem:
+            return await decode_vin(vin)
+
+    fetched = dict(zip(misses, await asyncio.gather(*(fetch(vin) for vin in misses))))
+    await run_in_threadpool(_cache_vin_decodes, db, fetched)
+    decoded.update(fetched)
+    return decoded
+
+
+def _get_cached_vin_decodes(db: Session, vins: List[str]) -> dict:
+    rows = db.query(VinDecodeCache).filter(VinDecodeCache.vin.in_(vins)).all()
+    return {row.vin: {f: getattr(row, f) for f in _VIN_DECODE_FIELDS} for row in rows}
+
+
+def _cache_vin_decodes(db: Session, decoded: dict):
+    # Failed decodes come back empty and unknown VINs come back with every
+    # field None; only cache real answers
+    db.add_all([
+        VinDecodeCache(vin=vin, **{f: d.get(f) for f in _VIN_DECODE_FIELDS})
+        for vin, d in decoded.items() if d and any(d.values())
+    ])
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another request decoded one of these VINs first
+        db.rollback()
+
+
+def _find_active_vehicle_by_vin(db: Session, dealership_id: int, vin: str) -> Optional[Vehicle]:
+    return db.query(Vehicle).filter(
         Vehicle.dealership_id == dealership_id,
-        Vehicle.vin == payload.vin.upper(),
+        Vehicle.vin == vin,
         Vehicle.status == VehicleStatus.active,
     ).first()
-    if existing:
-        raise HTTPException(400, f"Active vehicle with VIN {payload.vin} already exists (id={existing.id}).")
 
-    # Decode VIN
-    decoded = await decode_vin(payload.vin.upper())
 
+def _find_active_vehicles_by_vin(db: Session, dealership_id: int, vins: List[str]) -> List[Vehicle]:
+    return db.query(Vehicle).filter(
+        Vehicle.dealership_id == dealership_id,
+        Vehicle.vin.in_(vins),
+        Vehicle.status == VehicleStatus.active,
+    ).all()
+
+
+def _build_vehicle(dealership_id: int, payload: VinAddRequest, decoded: dict) -> Vehicle:
     v = Vehicle(
         dealership_id=dealership_id,
-        vin=payload.vin.upper(),
+        vin=payload.vin,
         year=decoded.get("year"),
         make=decoded.get("make"),
         model=decoded.get("model"),
@@ -204,6 +303,11 @@ async def add_vehicle_from_vin(
     if payload.date_acquired:
         v.days_in_inventory = (date.today() - payload.date_acquired).days
 
+    return v
+
+
+def _create_vehicle(db: Session, dealership_id: int, payload: VinAddRequest, decoded: dict) -> Vehicle:
+    v = _build_vehicle(dealership_id, payload, decoded)
     db.add(v)
     db.commit()
     db.refresh(v)
@@ -211,10 +315,43 @@ async def add_vehicle_from_vin(
     # Create empty signals record
     db.add(VehicleSignals(vehicle_id=v.id))
     db.commit()
+    db.refresh(v)  # reload here, not during serialization on the event loop
 
     return v
 
-@app.get("/api/vehicles")
+
+def _create_vehicles(db: Session, dealership_id: int, payloads: List[VinAddRequest], decoded: dict) -> List[Vehicle]:
+    vehicles = [_build_vehicle(dealership_id, p, decoded[p.vin]) for p in payloads]
+    db.add_all(vehicles)
+    db.flush()  # assigns ids for the signals rows
+    ids = [v.id for v in vehicles]
+    if ids:
+        # An empty parameter list would run a single-row INSERT of defaults
+        db.execute(insert(VehicleSignals), [{"vehicle_id": vid} for vid in ids])
+    db.commit()
+
+    # One SELECT reloads every expired instance in the identity map
+    db.query(Vehicle).filter(Vehicle.id.in_(ids)).all()
+    return vehicles
+
+# List routes validate straight from the ORM rows and dump JSON in
+# pydantic-core in one pass, skipping FastAPI's jsonable_encoder walk over
+# every field. The routes keep response_model for the OpenAPI schema;
+# returning a Response bypasses it
+_VEHICLE_LIST = TypeAdapter(List[VehicleOut])
+_COMP_LIST = TypeAdapter(List[CompOut])
+_INSIGHT_LIST = TypeAdapter(List[VehicleInsight])
+_PRICE_EVENT_LIST = TypeAdapter(List[PriceEventOut])
+
+
+def _json_list_response(adapter: TypeAdapter, rows: list) -> Response:
+    return Response(
+        adapter.dump_json(adapter.validate_python(rows, from_attributes=True)),
+        media_type="application/json",
+    )
+
+
+@app.get("/api/vehicles", response_model=List[VehicleOut])
 def list_vehicles(
     status: Optional[str] = Query(None),
     db: Session = Depends(get_db),
@@ -223,60 +360,40 @@ def list_vehicles(
     q = db.query(Vehicle).filter(Vehicle.dealership_id == dealership_id)
     if status:
         q = q.filter(Vehicle.status == status)
-    vehicles = q.order_by(Vehicle.days_in_inventory.desc()).all()
+    return _json_list_response(_VEHICLE_LIST, q.order_by(Vehicle.days_in_inventory.desc()).all())
 
-    # Refresh days_in_inventory
-    for v in vehicles:
-        if v.date_acquired and v.status == VehicleStatus.active:
-            v.days_in_inventory = (date.today() - v.date_acquired).days
-    db.commit()
 
-    return vehicles
-@app.get("/api/vehicle/{vehicle_id}")
+@app.get("/api/vehicles/{vehicle_id}", response_model=VehicleOut)
 def get_vehicle(
     vehicle_id: int,
     db: Session = Depends(get_db),
     dealership_id: int = Depends(get_dealership_id),
 ):
-    v = db.query(Vehicle).filter(
-        Vehicle.id == vehicle_id,
-        Vehicle.dealership_id == dealership_id,
-    ).first()
-    if not v:
-        raise HTTPException(404, "Vehicle not found.")
-
-    if v.date_acquired and v.status == VehicleStatus.active:
-        v.days_in_inventory = (date.today() - v.date_acquired).days
-        db.commit()
-
-    return v
+    return _get_vehicle_or_404(vehicle_id, dealership_id, db)
 
 
-@app.put("/api/vehicles/{vehicle_id}", )
+@app.put("/api/vehicles/{vehicle_id}", response_model=VehicleOut)
 def update_vehicle(
     vehicle_id: int,
     payload: VehicleUpdate,
     db: Session = Depends(get_db),
     dealership_id: int = Depends(get_dealership_id),
 ):
-    v = db.query(Vehicle).filter(
-        Vehicle.id == vehicle_id,
-        Vehicle.dealership_id == dealership_id,
-    ).first()
-    if not v:
-        raise HTTPException(404, "Vehicle not found.")
+    v = _get_vehicle_or_404(vehicle_id, dealership_id, db)
 
     old_price = v.list_price
     old_status = v.status
 
-    update_data = payload.dict(exclude_unset=True)
-    for key, val in update_data.items():
-        setattr(v, key, val)
+    # days_in_inventory is live while active; freeze it when the unit leaves
+    if payload.status is not None and payload.status != old_status and old_status == VehicleStatus.active:
+        v.days_in_inventory = v.days_in_inventory
+
+    for key in payload.model_fields_set:
+        setattr(v, key, getattr(payload, key))
 
     v.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(v)
 
+    # Event rows ride along in the same transaction as the update
     # Log price changes
     if payload.list_price is not None and payload.list_price != old_price:
         db.add(PriceEventLog(
@@ -288,7 +405,6 @@ def update_vehicle(
             reason="Manual price update by dealer.",
             triggered_by="user",
         ))
-        db.commit()
 
     # Log status changes
     if payload.status is not None and payload.status != old_status:
@@ -301,8 +417,9 @@ def update_vehicle(
             reason=f"Status changed from {old_status} to {payload.status}.",
             triggered_by="user",
         ))
-        db.commit()
 
+    db.commit()
+    db.refresh(v)
     return v
 
 
@@ -316,9 +433,7 @@ def update_signals(
     db: Session = Depends(get_db),
     dealership_id: int = Depends(get_dealership_id),
 ):
-    v = db.query(Vehicle).filter(Vehicle.id == vehicle_id, Vehicle.dealership_id == dealership_id).first()
-    if not v:
-        raise HTTPException(404, "Vehicle not found.")
+    v = _get_vehicle_or_404(vehicle_id, dealership_id, db)
 
     sig = db.query(VehicleSignals).filter(VehicleSignals.vehicle_id == vehicle_id).first()
     if not sig:
@@ -327,9 +442,8 @@ def update_signals(
         db.commit()
         db.refresh(sig)
 
-    update_data = payload.dict(exclude_unset=True)
-    for key, val in update_data.items():
-        setattr(sig, key, val)
+    for key in payload.model_fields_set:
+        setattr(sig, key, getattr(payload, key))
 
     sig.updated_at = datetime.utcnow()
     db.commit()
@@ -352,11 +466,10 @@ def get_signals(
 # ---------------------------------------------------------------------------
 
 def _get_vehicle_or_404(vehicle_id: int, dealership_id: int, db: Session) -> Vehicle:
-    v = db.query(Vehicle).filter(
-        Vehicle.id == vehicle_id,
-        Vehicle.dealership_id == dealership_id,
-    ).first()
-    if not v:
+    # Session.get checks the identity map first; the session lives for one
+    # request, so repeat lookups of the same vehicle in a request skip the SELECT
+    v = db.get(Vehicle, vehicle_id)
+    if not v or v.dealership_id != dealership_id:
         raise HTTPException(404, "Vehicle not found.")
     return v
 
@@ -366,37 +479,73 @@ def _generate_mock_comps(vehicle: Vehicle) -> List[dict]:
     Mock comp generator — produces realistic synthetic comps.
     PLUGGABLE: Replace this with Marketcheck, CarGurus, Manheim API calls.
     """
-    import random
-    random.seed(hash(vehicle.vin))
+    # All draws come from one generator as arrays. Seeded from a stable hash
+    # of the VIN so a vehicle gets the same comps across restarts
+    rng = np.random.default_rng(zlib.crc32(vehicle.vin.encode()))
 
     base_price = vehicle.list_price if vehicle.list_price else 25000
     base_mileage = vehicle.mileage if vehicle.mileage else 40000
-    comps = []
-
-    for i in range(random.randint(8, 18)):
-        price_variance = random.uniform(-0.12, 0.08)
-        mileage_variance = random.randint(-15000, 20000)
-        dom = random.randint(5, 75)
-        is_sold = random.random() < 0.4
 
-        comp_price = round(base_price * (1 + price_variance), 0)
-        comp_mileage = max(1000, base_mileage + mileage_variance)
-
-        comps.append({
-            "year": vehicle.year or 2022,
-            "make": vehicle.make or "Unknown",
-            "model": vehicle.model or "Unknown",
+    n = int(rng.integers(8, 19))
+    prices = np.round(base_price * (1 + rng.uniform(-0.12, 0.08, n)), 0)
+    mileages = np.maximum(1000, base_mileage + rng.integers(-15000, 20001, n))
+    doms = rng.integers(5, 76, n)
+    is_sold = rng.random(n) < 0.4
+    sold_prices = np.round(prices * rng.uniform(0.94, 1.0, n), 0)
+    distances = np.round(rng.uniform(5, 150, n), 1)
+    dealers = rng.integers(100, 1000, n)
+    delisted = rng.random(n) < 1 / 3
+
+    year = vehicle.year or 2022
+    make = vehicle.make or "Unknown"
+    model = vehicle.model or "Unknown"
+    return [
+        {
+            "year": year,
+            "make": make,
+            "model": model,
             "trim": vehicle.trim,
-            "mileage": comp_mileage,
-            "price": comp_price,
-            "sold_price": round(comp_price * random.uniform(0.94, 1.0), 0) if is_sold else None,
+            "mileage": mileage,
+            "price": price,
+            "sold_price": sold_price if sold else None,
             "days_on_market": dom,
-            "distance_miles": round(random.uniform(5, 150), 1),
-            "dealer_name": f"Dealer #{random.randint(100, 999)}",
-            "listing_status": "sold" if is_sold else random.choice(["active", "active", "delisted"]),
-        })
-
-    return comps
+            "distance_miles": distance,
+            "dealer_name": f"Dealer #{dealer}",
+            "listing_status": "sold" if sold else ("delisted" if gone else "active"),
+        }
+        for price, mileage, dom, sold, sold_price, distance, dealer, gone in zip(
+            prices.tolist(), mileages.tolist(), doms.tolist(), is_sold.tolist(),
+            sold_prices.tolist(), distances.tolist(), dealers.tolist(), delisted.tolist(),
+        )
+    ]
+
+
+def _auto_comp_row(vehicle_id: int, c: dict) -> dict:
+    """Comp table row for one generated/fetched auto comp."""
+    return {
+        "vehicle_id": vehicle_id,
+        "source": CompSource.auto,
+        "year": c["year"],
+        "make": c["make"],
+        "model": c["model"],
+        "trim": c.get("trim"),
+        "mileage": c["mileage"],
+        "price": c["price"],
+        "sold_price": c.get("sold_price"),
+        "days_on_market": c.get("days_on_market"),
+        "distance_miles": c.get("distance_miles"),
+        "dealer_name": c.get("dealer_name"),
+        "listing_status": c.get("listing_status", "active"),
+    }
+
+
+def _bulk_insert_comps(db: Session, rows: List[dict]):
+    """One executemany INSERT instead of an ORM object + flush per comp."""
+    if rows:
+        # Core, not insert(Comp): the ORM bulk path starts a new batch
+        # wherever the pattern of None values changes (e.g. sold_price).
+        # found_at is bound once for the batch rather than by the per-row default
+        db.execute(Comp.__table__.insert().values(found_at=datetime.utcnow()), rows)
 
 
 @app.post("/api/vehicles/{vehicle_id}/comps/refresh", )
@@ -411,31 +560,18 @@ def refresh_comps(
     """
     v = _get_vehicle_or_404(vehicle_id, dealership_id, db)
 
-    # Remove old auto comps
+    # Remove old auto comps. No Comp instances are loaded in this session,
+    # so skip matching the delete against the identity map
     db.query(Comp).filter(
         Comp.vehicle_id == vehicle_id,
         Comp.source == CompSource.auto,
-    ).delete()
-    db.commit()
+    ).delete(synchronize_session=False)
 
     # Generate new comps
     mock_comps = _generate_mock_comps(v)
-    for c in mock_comps:
-        db.add(Comp(
-            vehicle_id=vehicle_id,
-            source=CompSource.auto,
-            year=c["year"],
-            make=c["make"],
-            model=c["model"],
-            trim=c.get("trim"),
-            mileage=c["mileage"],
-            price=c["price"],
-            sold_price=c.get("sold_price"),
-            days_on_market=c.get("days_on_market"),
-            distance_miles=c.get("distance_miles"),
-            dealer_name=c.get("dealer_name"),
-            listing_status=c.get("listing_status", "active"),
-        ))
+    _bulk_insert_comps(db, [_auto_comp_row(vehicle_id, c) for c in mock_comps])
+    # Delete and insert commit together, so a failure can't leave the
+    # vehicle without comps
     db.commit()
 
     # Rebuild summary
@@ -487,42 +623,84 @@ async def upload_comps(
     """
     Upload CSV with columns: year,make,model,trim,mileage,price,sold_price,days_on_market,distance_miles,dealer_name,listing_status
     """
-    _get_vehicle_or_404(vehicle_id, dealership_id, db)
+    await run_in_threadpool(_get_vehicle_or_404, vehicle_id, dealership_id, db)
+
+    # Decode and parse straight off the spooled upload rather than reading
+    # the whole file into memory first
+    text = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        count = await run_in_threadpool(_ingest_comp_csv, db, vehicle_id, text)
+    finally:
+        text.detach()
+
+    return MessageResponse(message=f"Uploaded {count} manual comps from CSV.", detail={"count": count})
+
+
+_COMP_CSV_COLUMNS = (
+    "year", "make", "model", "trim", "mileage", "price", "sold_price",
+    "days_on_market", "distance_miles", "dealer_name", "listing_status",
+)
+
+
+_COMP_CSV_CHUNK = 1000
 
-    content = await file.read()
-    text = content.decode("utf-8-sig")
-    reader = csv.DictReader(io.StringIO(text))
+
+def _ingest_comp_csv(db: Session, vehicle_id: int, lines) -> int:
+    """Parse an uploaded comp CSV, insert the valid rows, rebuild the summary. Returns rows inserted."""
+    reader = csv.reader(lines)
+    header = next(reader, [])
+
+    # Resolve column positions once; a column missing from the header points
+    # at the trailing None slot every row gets below
+    width = len(header)
+    col = {name: i for i, name in enumerate(header)}
+    (i_year, i_make, i_model, i_trim, i_mileage, i_price, i_sold, i_dom,
+     i_dist, i_dealer, i_status) = (col.get(name, width) for name in _COMP_CSV_COLUMNS)
+    pad = [None] * width
 
     count = 0
+    rows = []
     for row in reader:
+        if len(rows) >= _COMP_CSV_CHUNK:
+            _bulk_insert_comps(db, rows)
+            count += len(rows)
+            rows = []
+        if not row:
+            continue
+        if len(row) != width:
+            row = (row + pad)[:width]
+        row.append(None)
         try:
-            c = Comp(
-                vehicle_id=vehicle_id,
-                source=CompSource.manual,
-                year=int(row.get("year", 0)) or None,
-                make=row.get("make"),
-                model=row.get("model"),
-                trim=row.get("trim"),
-                mileage=int(row.get("mileage", 0)) if row.get("mileage") else None,
-                price=float(row.get("price", 0)) if row.get("price") else None,
-                sold_price=float(row.get("sold_price", 0)) if row.get("sold_price") else None,
-                days_on_market=int(row.get("days_on_market", 0)) if row.get("days_on_market") else None,
-                distance_miles=float(row.get("distance_miles", 0)) if row.get("distance_miles") else None,
-                dealer_name=row.get("dealer_name"),
-                listing_status=row.get("listing_status", "active"),
-            )
-            db.add(c)
-            count += 1
-        except (ValueError, KeyError):
+            year, mileage, price = row[i_year], row[i_mileage], row[i_price]
+            sold, dom, dist = row[i_sold], row[i_dom], row[i_dist]
+            rows.append({
+                "vehicle_id": vehicle_id,
+                "source": CompSource.manual,
+                "year": int(year if year is not None else 0) or None,
+                "make": row[i_make],
+                "model": row[i_model],
+                "trim": row[i_trim],
+                "mileage": int(mileage) if mileage else None,
+                "price": float(price) if price else None,
+                "sold_price": float(sold) if sold else None,
+                "days_on_market": int(dom) if dom else None,
+                "distance_miles": float(dist) if dist else None,
+                "dealer_name": row[i_dealer],
+                "listing_status": row[i_status] if i_status < width else "active",
+            })
+        except ValueError:
             continue
 
+    _bulk_insert_comps(db, rows)
+    count += len(rows)
     db.commit()
-    _rebuild_comp_summary(vehicle_id, db)
+    if count:
+        _rebuild_comp_summary(vehicle_id, db)
 
-    return MessageResponse(message=f"Uploaded {count} manual comps from CSV.", detail={"count": count})
+    return count
 
 
-@app.get("/api/vehicles/{vehicle_id}/comps", )
+@app.get("/api/vehicles/{vehicle_id}/comps", response_model=List[CompOut])
 def list_comps(
     vehicle_id: int,
     source: Optional[str] = Query(None, description="auto|manual|all"),
@@ -537,7 +715,7 @@ def list_comps(
     elif source == "manual":
         q = q.filter(Comp.source == CompSource.manual)
 
-    return q.order_by(Comp.found_at.desc()).all()
+    return _json_list_response(_COMP_LIST, q.order_by(Comp.found_at.desc()).all())
 
 
 @app.get("/api/vehicles/{vehicle_id}/comps/summary", )
@@ -556,14 +734,15 @@ def get_comp_summary(
 
 def _rebuild_comp_summary(vehicle_id: int, db: Session):
     """Rebuild the CompSummary for a vehicle using engine."""
-    auto_comps = db.query(Comp).filter(
-        Comp.vehicle_id == vehicle_id,
-        Comp.source == CompSource.auto,
-    ).all()
-    manual_comps = db.query(Comp).filter(
-        Comp.vehicle_id == vehicle_id,
-        Comp.source == CompSource.manual,
-    ).all()
+    # Medians need the individual values (no portable percentile_cont on
+    # SQLite), so fetch just the four columns the summary reads as plain rows
+    # — no ORM instances or identity-map bookkeeping
+    comps = db.execute(lambda_stmt(
+        lambda: select(Comp.source, Comp.price, Comp.days_on_market, Comp.listing_status)
+        .where(Comp.vehicle_id == vehicle_id)
+    )).all()
+    auto_comps = [c for c in comps if c.source == CompSource.auto]
+    manual_comps = [c for c in comps if c.source == CompSource.manual]
 
     summary_data = engine.build_comp_summary(auto_comps, manual_comps)
 
@@ -579,6 +758,50 @@ def _rebuild_comp_summary(vehicle_id: int, db: Session):
     db.commit()
 
 
+def _rebuild_comp_summaries(vehicle_ids: List[int], db: Session):
+    """
+    Batch _rebuild_comp_summary for vehicles whose comps are known to have
+    changed: one SELECT for every comp, one for the existing summary ids, then
+    one executemany UPDATE and one INSERT — regardless of vehicle count.
+    """
+    if not vehicle_ids:
+        return
+
+    by_vehicle = {vid: ([], []) for vid in vehicle_ids}
+    comps = db.execute(
+        select(Comp.vehicle_id, Comp.source, Comp.price, Comp.days_on_market, Comp.listing_status)
+        .where(Comp.vehicle_id.in_(vehicle_ids))
+    ).all()
+    for c in comps:
+        auto, manual = by_vehicle[c.vehicle_id]
+        if c.source == CompSource.auto:
+            auto.append(c)
+        elif c.source == CompSource.manual:
+            manual.append(c)
+
+    summary_ids = dict(db.execute(
+        select(CompSummary.vehicle_id, CompSummary.id).where(CompSummary.vehicle_id.in_(vehicle_ids))
+    ).all())
+
+    now = datetime.utcnow()
+    updates, inserts = [], []
+    for vid, (auto, manual) in by_vehicle.items():
+        data = engine.build_comp_summary(auto, manual)
+        data["computed_at"] = now
+        if vid in summary_ids:
+            updates.append({"id": summary_ids[vid], **data})
+        else:
+            inserts.append({"vehicle_id": vid, **data})
+
+    if updates:
+        db.execute(update(CompSummary), updates)
+    if inserts:
+        # Core insert: the ORM bulk path splits the batch wherever the
+        # pattern of None values changes between rows
+        db.execute(CompSummary.__table__.insert(), inserts)
+    db.commit()
+
+
 # ---------------------------------------------------------------------------
 # ANALYSIS ROUTES
 # ---------------------------------------------------------------------------
@@ -592,11 +815,6 @@ def analyze_vehicle(
     """Full analysis — returns complete report including 90-day curve."""
     v = _get_vehicle_or_404(vehicle_id, dealership_id, db)
 
-    # Refresh days
-    if v.date_acquired and v.status == VehicleStatus.active:
-        v.days_in_inventory = (date.today() - v.date_acquired).days
-        db.commit()
-
     comp_summary = db.query(CompSummary).filter(CompSummary.vehicle_id == vehicle_id).first()
     signals = db.query(VehicleSignals).filter(VehicleSignals.vehicle_id == vehicle_id).first()
 
@@ -608,7 +826,11 @@ def analyze_vehicle(
     db.commit()
     db.refresh(report)
 
-    return report
+    # The curve is already plain JSON from the column; encode the scalar
+    # fields and attach it as-is rather than walking its ~450 values
+    body = jsonable_encoder(report, exclude={"daily_curve"})
+    body["daily_curve"] = report.daily_curve
+    return JSONResponse(body)
 
 
 @app.get("/api/vehicles/{vehicle_id}/curve")
@@ -619,66 +841,129 @@ def get_curve(
     dealership_id: int = Depends(get_dealership_id),
 ):
     """Return just the daily curve from the latest analysis."""
-    report = db.query(AnalysisReport).filter(
-        AnalysisReport.vehicle_id == vehicle_id,
-    ).order_by(AnalysisReport.computed_at.desc()).first()
+    # Seek on ix_reports_vehicle_computed and pull only the curve column;
+    # same tie-break as get_insights so both agree on "latest"
+    daily_curve = db.execute(
+        select(AnalysisReport.daily_curve)
+        .where(AnalysisReport.vehicle_id == vehicle_id)
+        .order_by(AnalysisReport.computed_at.desc(), AnalysisReport.id.desc())
+        .limit(1)
+    ).scalar()
+
+    if not daily_curve:
+        raise HTTPException(404, "No analysis found. Run analyze first.")
+
+    # Plain ints/floats straight from the JSON column: skip jsonable_encoder's
+    # per-value walk and serialize directly
+    curve = engine.slice_curve(daily_curve, days)
+    return JSONResponse({"vehicle_id": vehicle_id, "days": len(curve["day"]), "curve": curve})
+
+# Summary columns only — the curve JSON and free-text fields stay in the row
+_REPORT_SUMMARY_COLUMNS = tuple(
+    AnalysisReport.__table__.c[name] for name in AnalysisReportSummaryOut.model_fields
+)
+
 
-    if not report or not report.daily_curve:
+@app.get("/api/vehicles/{vehicle_id}/analysis/summary", response_model=AnalysisReportSummaryOut)
+def get_analysis_summary(
+    vehicle_id: int,
+    db: Session = Depends(get_db),
+    dealership_id: int = Depends(get_dealership_id),
+):
+    """Scalars from the latest analysis, without re-running it. Curve is at /curve."""
+    _get_vehicle_or_404(vehicle_id, dealership_id, db)
+
+    row = db.execute(
+        select(*_REPORT_SUMMARY_COLUMNS)
+        .where(AnalysisReport.vehicle_id == vehicle_id)
+        .order_by(AnalysisReport.computed_at.desc(), AnalysisReport.id.desc())
+        .limit(1)
+    ).mappings().first()
+    if not row:
         raise HTTPException(404, "No analysis found. Run analyze first.")
+    return row
 
-    curve = report.daily_curve[:days]
-    return {"vehicle_id": vehicle_id, "days": len(curve), "curve": curve}
 
-@app.get("/api/inventory/insights")
+@app.get("/api/inventory/insights", response_model=List[VehicleInsight])
 def get_insights(
     status: str = Query("active"),
     db: Session = Depends(get_db),
     dealership_id: int = Depends(get_dealership_id),
 ):
-    vehicles = db.query(Vehicle).filter(
+    # Latest report per vehicle in the same round-trip (window function)
+    # instead of one ORDER BY ... LIMIT 1 query per vehicle
+    latest = select(
+        AnalysisReport.id,
+        AnalysisReport.vehicle_id,
+        func.row_number().over(
+            partition_by=AnalysisReport.vehicle_id,
+            order_by=(AnalysisReport.computed_at.desc(), AnalysisReport.id.desc()),
+        ).label("rn"),
+    ).join(Vehicle, Vehicle.id == AnalysisReport.vehicle_id).where(
+        Vehicle.dealership_id == dealership_id,
+    ).subquery()
+
+    # Project just the columns the insight rows need — the report's
+    # daily_curve JSON is never read here, so don't fetch or decode it
+    stmt = select(
+        Vehicle.id,
+        Vehicle.vin,
+        Vehicle.year,
+        Vehicle.make,
+        Vehicle.model,
+        Vehicle.trim,
+        Vehicle.status,
+        Vehicle.days_in_inventory,
+        Vehicle.list_price,
+        Vehicle.acquisition_cost,
+        Vehicle.recon_cost,
+        AnalysisReport.p30,
+        AnalysisReport.p60,
+        AnalysisReport.p90,
+        AnalysisReport.aging_class,
+        AnalysisReport.daily_carry_cost,
+        AnalysisReport.inflection_day,
+        AnalysisReport.price_action,
+        AnalysisReport.action_plan,
+    ).outerjoin(
+        latest, and_(latest.c.vehicle_id == Vehicle.id, latest.c.rn == 1),
+    ).outerjoin(
+        AnalysisReport, AnalysisReport.id == latest.c.id,
+    ).where(
         Vehicle.dealership_id == dealership_id,
         Vehicle.status == status,
-    ).order_by(Vehicle.days_in_inventory.desc()).all()
+    ).order_by(Vehicle.days_in_inventory.desc())
 
     insights = []
-    for v in vehicles:
-        if v.date_acquired and v.status == VehicleStatus.active:
-            v.days_in_inventory = (date.today() - v.date_acquired).days
-
-        report = db.query(AnalysisReport).filter(
-            AnalysisReport.vehicle_id == v.id,
-        ).order_by(AnalysisReport.computed_at.desc()).first()
-
+    for row in db.execute(stmt):
         one_line = None
-        if report and report.action_plan:
-            actions = report.action_plan
-            if isinstance(actions, list) and len(actions) > 0:
-                one_line = actions[0]
+        actions = row.action_plan
+        if isinstance(actions, list) and len(actions) > 0:
+            one_line = actions[0]
 
         insights.append({
-            "vehicle_id": v.id,
-            "vin": v.vin,
-            "year": v.year,
-            "make": v.make,
-            "model": v.model,
-            "trim": v.trim,
-            "status": v.status,
-            "days_in_inventory": v.days_in_inventory or 0,
-            "list_price": v.list_price or 0,
-            "acquisition_cost": v.acquisition_cost or 0,
-            "recon_cost": v.recon_cost or 0,
-            "p30": report.p30 if report else None,
-            "p60": report.p60 if report else None,
-            "p90": report.p90 if report else None,
-            "aging_class": report.aging_class if report else None,
-            "daily_carry_cost": report.daily_carry_cost if report else None,
-            "inflection_day": report.inflection_day if report else None,
-            "price_action": report.price_action if report else None,
+            "vehicle_id": row.id,
+            "vin": row.vin,
+            "year": row.year,
+            "make": row.make,
+            "model": row.model,
+            "trim": row.trim,
+            "status": row.status,
+            "days_in_inventory": row.days_in_inventory or 0,
+            "list_price": row.list_price or 0,
+            "acquisition_cost": row.acquisition_cost or 0,
+            "recon_cost": row.recon_cost or 0,
+            "p30": row.p30,
+            "p60": row.p60,
+            "p90": row.p90,
+            "aging_class": row.aging_class,
+            "daily_carry_cost": row.daily_carry_cost,
+            "inflection_day": row.inflection_day,
+            "price_action": row.price_action,
             "one_line_action": one_line,
         })
 
-    db.commit()
-    return insights
+    return _json_list_response(_INSIGHT_LIST, insights)
   # ---------------------------------------------------------------------------
 # FLOORPLAN ALARM ROUTES
 # ---------------------------------------------------------------------------
@@ -691,7 +976,7 @@ def run_alarm(
     """Manual trigger — generates alarm for today."""
     # Get config
     config = db.query(AlarmConfig).filter(AlarmConfig.dealership_id == dealership_id).first()
-    thresholds = config.thresholds if config else [30, 45, 60, 75]
+    thresholds = config.thresholds if config else DEFAULT_ALARM_THRESHOLDS
 
     # Get active vehicles
     vehicles = db.query(Vehicle).filter(
@@ -699,12 +984,6 @@ def run_alarm(
         Vehicle.status == VehicleStatus.active,
     ).all()
 
-    # Refresh days
-    for v in vehicles:
-        if v.date_acquired:
-            v.days_in_inventory = (date.today() - v.date_acquired).days
-    db.commit()
-
     # Generate alarm
     alarm_data = engine.generate_alarm(vehicles, thresholds, dealership_id)
 
@@ -775,9 +1054,8 @@ def update_alarm_config(
         db.commit()
         db.refresh(config)
 
-    update_data = payload.dict(exclude_unset=True)
-    for key, val in update_data.items():
-        setattr(config, key, val)
+    for key in payload.model_fields_set:
+        setattr(config, key, getattr(payload, key))
 
     db.commit()
     db.refresh(config)
@@ -799,6 +1077,64 @@ def get_alarm_config(
 # PRICING WATERFALL ROUTES
 # ---------------------------------------------------------------------------
 
+# Plan/apply read the same settings row on every call and it rarely changes.
+# Cache (rules, price_floor_policy) per dealership; the PUT below evicts the
+# entry, and the TTL bounds staleness across workers
+_WATERFALL_CACHE_TTL = 300  # seconds
+_waterfall_cache: Dict[int, Tuple[float, list, str]] = {}
+
+
+def _get_waterfall_config(db: Session, dealership_id: int) -> Optional[Tuple[list, str]]:
+    now = time.monotonic()
+    hit = _waterfall_cache.get(dealership_id)
+    if hit and hit[0] > now:
+        return hit[1], hit[2]
+
+    row = db.execute(
+        select(PricingWaterfallSettings.rules, PricingWaterfallSettings.price_floor_policy)
+        .where(PricingWaterfallSettings.dealership_id == dealership_id)
+        .limit(1)
+    ).first()
+    if row is None:
+        _waterfall_cache.pop(dealership_id, None)
+        return None
+
+    _waterfall_cache[dealership_id] = (now + _WATERFALL_CACHE_TTL, row.rules, row.price_floor_policy)
+    return row.rules, row.price_floor_policy
+
+
+# The plan is a pure function of these vehicle fields plus the rules and
+# floor policy, so the inputs themselves are the cache key: a price or cost
+# change, or a settings update, produces a new key rather than needing an
+# explicit eviction. Bounded; the oldest entry goes first
+_WATERFALL_PLAN_FIELDS = (
+    "id", "acquisition_cost", "recon_cost", "floorplan_rate_apr", "list_price", "wholesale_exit_price",
+)
+_MAX_WATERFALL_PLANS = 1000
+_waterfall_plan_cache: Dict[tuple, dict] = {}
+
+
+def _get_waterfall_plan(v: Vehicle, rules: list, price_floor_policy: str) -> dict:
+    """Cached engine.generate_waterfall_plan. Callers must not mutate the result."""
+    key = (
+        tuple(getattr(v, f) for f in _WATERFALL_PLAN_FIELDS),
+        tuple(tuple(r.items()) for r in rules),
+        price_floor_policy,
+    )
+    plan = _waterfall_plan_cache.get(key)
+    if plan is None:
+        plan = engine.generate_waterfall_plan(v, rules, price_floor_policy)
+        # Sync routes call this from the threadpool: another request may evict
+        # the same entry first, or resize the dict while we pick the oldest
+        if len(_waterfall_plan_cache) >= _MAX_WATERFALL_PLANS:
+            try:
+                _waterfall_plan_cache.pop(next(iter(_waterfall_plan_cache), None), None)
+            except RuntimeError:
+                pass
+        _waterfall_plan_cache[key] = plan
+    return plan
+
+
 @app.get("/api/settings/pricing-waterfall", )
 def get_waterfall_settings(
     db: Session = Depends(get_db),
@@ -827,19 +1163,17 @@ def update_waterfall_settings(
         db.commit()
         db.refresh(settings)
 
-    update_data = payload.dict(exclude_unset=True)
-
-    # Convert rules from Pydantic models to dicts for JSON storage
-    if "rules" in update_data and update_data["rules"] is not None:
-        update_data["rules"] = [
-            r.dict() if hasattr(r, "dict") else r for r in update_data["rules"]
-        ]
-
-    for key, val in update_data.items():
+    for key in payload.model_fields_set:
+        val = getattr(payload, key)
+        # Rules are stored as JSON: dump the models, sorted so plan
+        # generation doesn't have to re-sort on every call
+        if key == "rules" and val is not None:
+            val = engine.sort_waterfall_rules([r.model_dump() for r in val])
         setattr(settings, key, val)
 
     settings.updated_at = datetime.utcnow()
     db.commit()
+    _waterfall_cache.pop(dealership_id, None)
     db.refresh(settings)
     return settings
 
@@ -852,23 +1186,10 @@ def generate_waterfall_plan(
 ):
     v = _get_vehicle_or_404(vehicle_id, dealership_id, db)
 
-    # Refresh days
-    if v.date_acquired and v.status == VehicleStatus.active:
-        v.days_in_inventory = (date.today() - v.date_acquired).days
-        db.commit()
-
-    settings = db.query(PricingWaterfallSettings).filter(
-        PricingWaterfallSettings.dealership_id == dealership_id,
-    ).first()
-
-    if not settings:
+    config = _get_waterfall_config(db, dealership_id)
+    if not config:
         raise HTTPException(404, "No waterfall settings configured.")
-
-    plan_data = engine.generate_waterfall_plan(
-        vehicle=v,
-        rules=settings.rules,
-        price_floor_policy=settings.price_floor_policy,
-    )
+    plan_data = _get_waterfall_plan(v, *config)
 
     return WaterfallPlanOut(
         vehicle_id=plan_data["vehicle_id"],
@@ -880,7 +1201,7 @@ def generate_waterfall_plan(
     )
 
 
-@app.post("/api/vehicles/{vehicle_id}/pricing-waterfall/apply", )
+@app.post("/api/vehicles/{vehicle_id}/pricing-waterfall/apply", response_model=VehicleOut)
 def apply_waterfall_step(
     vehicle_id: int,
     step: int = Query(1, ge=1, description="Which step number to apply"),
@@ -894,13 +1215,11 @@ def apply_waterfall_step(
     v = _get_vehicle_or_404(vehicle_id, dealership_id, db)
 
     # Generate the plan to get the step
-    settings = db.query(PricingWaterfallSettings).filter(
-        PricingWaterfallSettings.dealership_id == dealership_id,
-    ).first()
-    if not settings:
+    config = _get_waterfall_config(db, dealership_id)
+    if not config:
         raise HTTPException(404, "No waterfall settings configured.")
 
-    plan_data = engine.generate_waterfall_plan(v, settings.rules, settings.price_floor_policy)
+    plan_data = _get_waterfall_plan(v, *config)
 
     # Find the requested step
     target_step = None
@@ -943,7 +1262,7 @@ def apply_waterfall_step(
 # PRICE EVENT LOG ROUTES
 # ---------------------------------------------------------------------------
 
-@app.get("/api/vehicles/{vehicle_id}/price-events", )
+@app.get("/api/vehicles/{vehicle_id}/price-events", response_model=List[PriceEventOut])
 def get_price_events(
     vehicle_id: int,
     db: Session = Depends(get_db),
@@ -951,23 +1270,86 @@ def get_price_events(
 ):
     _get_vehicle_or_404(vehicle_id, dealership_id, db)
 
-    events = db.query(PriceEventLog).filter(
-        PriceEventLog.vehicle_id == vehicle_id,
-        PriceEventLog.dealership_id == dealership_id,
-    ).order_by(PriceEventLog.created_at.desc()).all()
-
-    return events
+    # Plain rows: nothing here needs ORM instances or the identity map
+    return _json_list_response(_PRICE_EVENT_LIST, db.execute(
+        select(PriceEventLog.__table__).where(
+            PriceEventLog.vehicle_id == vehicle_id,
+            PriceEventLog.dealership_id == dealership_id,
+        ).order_by(PriceEventLog.created_at.desc())
+    ).all())
 
 
-@app.get("/api/price-events", )
+@app.get("/api/price-events", response_model=List[PriceEventOut])
 def get_all_price_events(
     limit: int = Query(50, ge=1, le=500),
     db: Session = Depends(get_db),
     dealership_id: int = Depends(get_dealership_id),
 ):
-    return db.query(PriceEventLog).filter(
-        PriceEventLog.dealership_id == dealership_id,
-    ).order_by(PriceEventLog.created_at.desc()).limit(limit).all()
+    return _json_list_response(_PRICE_EVENT_LIST, db.execute(
+        select(PriceEventLog.__table__).where(
+            PriceEventLog.dealership_id == dealership_id,
+        ).order_by(PriceEventLog.created_at.desc()).limit(limit)
+    ).all())
+
+
+# ---------------------------------------------------------------------------
+# BACKGROUND JOBS
+# ---------------------------------------------------------------------------
+# In-process registry: jobs run on this worker's threadpool after the response
+# is sent, so the status lives with the worker that accepted the job
+_JOBS: Dict[str, dict] = {}
+_MAX_JOBS = 500
+
+
+def _create_job(job_type: str, dealership_id: int) -> dict:
+    # Drop the oldest finished jobs once the registry is full. Sync routes call
+    # this from the threadpool, so snapshot the items and tolerate another
+    # request evicting the same job first
+    if len(_JOBS) >= _MAX_JOBS:
+        for job_id in [j for j, job in list(_JOBS.items()) if job["state"] in ("success", "failure")]:
+            _JOBS.pop(job_id, None)
+            if len(_JOBS) < _MAX_JOBS:
+                break
+    job = {
+        "id": uuid.uuid4().hex,
+        "type": job_type,
+        "dealership_id": dealership_id,
+        "state": "pending",
+        "result": None,
+        "error": None,
+        "created_at": datetime.utcnow(),
+        "finished_at": None,
+    }
+    _JOBS[job["id"]] = job
+    return job
+
+
+def _run_job(job_id: str, fn, *args):
+    """Run fn(db, *args) with its own session — the request's is closed by now."""
+    job = _JOBS[job_id]
+    job["state"] = "running"
+    db = SessionLocal()
+    try:
+        job["result"] = fn(db, *args)
+        job["state"] = "success"
+    except Exception as e:
+        db.rollback()
+        job["error"] = str(e)
+        job["state"] = "failure"
+    finally:
+        db.close()
+        job["finished_at"] = datetime.utcnow()
+
+
+@app.get("/api/jobs/{job_id}", )
+def get_job(
+    job_id: str,
+    dealership_id: int = Depends(get_dealership_id),
+):
+    job = _JOBS.get(job_id)
+    if not job or job["dealership_id"] != dealership_id:
+        raise HTTPException(404, "Job not found.")
+    return job
 
 
 # ---------------------------------------------------------------------------
@@ -976,33 +1358,54 @@ def get_all_price_events(
 
 @app.post("/api/vehicles/analyze-all", )
 def analyze_all_vehicles(
-    db: Session = Depends(get_db),
+    background_tasks: BackgroundTasks,
     dealership_id: int = Depends(get_dealership_id),
 ):
-    """Run analysis on all active vehicles. Useful for daily batch."""
-    vehicles = db.query(Vehicle).filter(
-        Vehicle.dealership_id == dealership_id,
-        Vehicle.status == VehicleStatus.active,
-    ).all()
-
+    """
+    Queue analysis of all active vehicles and return a job id straight away;
+    poll GET /api/jobs/{job_id} for the result. Useful for daily batch.
+    """
+    job = _create_job("analyze_all", dealership_id)
+    background_tasks.add_task(_run_job, job["id"], _analyze_all_vehicles, dealership_id)
+    return MessageResponse(message="Analysis of active vehicles queued.", detail={"job_id": job["id"]})
+
+
+_ANALYZE_CHUNK = 500
+
+
+def _analyze_all_vehicles(db: Session, dealership_id: int) -> dict:
+    # Vehicles stream in chunks of _ANALYZE_CHUNK (server-side cursor on
+    # Postgres) so a large inventory is never held in memory at once.
+    # selectinload fetches each chunk's summaries and signals in one IN query
+    # apiece, so the relationship reads below never lazy-load
+    result = db.execute(
+        select(Vehicle).options(
+            selectinload(Vehicle.comp_summary),
+            selectinload(Vehicle.signals),
+        ).where(
+            Vehicle.dealership_id == dealership_id,
+            Vehicle.status == VehicleStatus.active,
+        ).execution_options(yield_per=_ANALYZE_CHUNK)
+    ).scalars()
+
+    # One timestamp for the whole run instead of the column default firing per row
+    now = datetime.utcnow()
     count = 0
-    for v in vehicles:
-        if v.date_acquired:
-            v.days_in_inventory = (date.today() - v.date_acquired).days
-
-        comp_summary = db.query(CompSummary).filter(CompSummary.vehicle_id == v.id).first()
-        signals = db.query(VehicleSignals).filter(VehicleSignals.vehicle_id == v.id).first()
-
-        result = engine.run_full_analysis(v, comp_summary, signals)
-        report = AnalysisReport(vehicle_id=v.id, **result)
-        db.add(report)
-        count += 1
-
+    for vehicles in result.partitions():
+        # One vectorized pass per chunk instead of N scalar analyses
+        results = engine.run_full_analysis_batch(
+            vehicles,
+            [v.comp_summary for v in vehicles],
+            [v.signals for v in vehicles],
+        )
+        # Nothing reads the reports back here, so skip ORM instances and insert
+        # each chunk in one executemany through the Core table
+        db.execute(AnalysisReport.__table__.insert(), [
+            {"vehicle_id": v.id, "computed_at": now, **r} for v, r in zip(vehicles, results)
+        ])
+        count += len(vehicles)
     db.commit()
-    return MessageResponse(
-        message=f"Analyzed {count} active vehicles.",
-        detail={"count": count},
-    )
+    return {"count": count}
 
 
 @app.post("/api/vehicles/refresh-all-comps", )
@@ -1016,39 +1419,22 @@ def refresh_all_comps(
         Vehicle.status == VehicleStatus.active,
     ).all()
 
-    count = 0
-    for v in vehicles:
-        # Remove old auto comps
-        db.query(Comp).filter(
-            Comp.vehicle_id == v.id,
-            Comp.source == CompSource.auto,
-        ).delete()
-
-        # Generate new
-        mock_comps = _generate_mock_comps(v)
-        for c in mock_comps:
-            db.add(Comp(
-                vehicle_id=v.id,
-                source=CompSource.auto,
-                year=c["year"],
-                make=c["make"],
-                model=c["model"],
-                trim=c.get("trim"),
-                mileage=c["mileage"],
-                price=c["price"],
-                sold_price=c.get("sold_price"),
-                days_on_market=c.get("days_on_market"),
-                distance_miles=c.get("distance_miles"),
-                dealer_name=c.get("dealer_name"),
-                listing_status=c.get("listing_status", "active"),
-            ))
-        count += 1
+    # Remove old auto comps for every vehicle in one DELETE ... IN
+    ids = [v.id for v in vehicles]
+    db.query(Comp).filter(
+        Comp.vehicle_id.in_(ids),
+        Comp.source == CompSource.auto,
+    ).delete(synchronize_session=False)
 
-    db.commit()
+    # Generate new
+    rows = [_auto_comp_row(v.id, c) for v in vehicles for c in _generate_mock_comps(v)]
+    count = len(vehicles)
+
+    _bulk_insert_comps(db, rows)
 
-    # Rebuild summaries
-    for v in vehicles:
-        _rebuild_comp_summary(v.id, db)
+    # Rebuild summaries — every vehicle's auto comps just changed. One commit
+    # at the end of the rebuild covers the delete, insert and summaries
+    _rebuild_comp_summaries(ids, db)
 
     return MessageResponse(
         message=f"Refreshed comps for {count} vehicles.",
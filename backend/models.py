@@ -4,9 +4,13 @@ import os
 from datetime import datetime, date
 from sqlalchemy import (
     create_engine, Column, Integer, String, Float, Text, Boolean,
-    Date, DateTime, ForeignKey, JSON, Enum as SAEnum
+    Date, DateTime, ForeignKey, Index, JSON, Enum as SAEnum, and_, bindparam, case
 )
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import declarative_base, sessionmaker, relationship
+from sqlalchemy.pool import NullPool
+from sqlalchemy.sql.functions import FunctionElement
 import enum
 
 # ---------------------------------------------------------------------------
@@ -18,20 +22,53 @@ DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./dev.db")
 if DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
+# Set when Postgres sits behind pgbouncer in transaction mode; pgbouncer owns
+# the pool, so the app opens and closes a connection per checkout
+PGBOUNCER = os.getenv("PGBOUNCER", "").lower() in ("1", "true", "yes")
+
 NHTSA_API_URL = os.getenv("NHTSA_API_URL", "https://vpic.nhtsa.dot.gov/api/vehicles")
 ALLOWED_ORIGINS = [
     "http://localhost:5173",
     "https://thirty-sixty-ninety.onrender.com",
     "https://three0-60-90-trial-1.onrender.com",
 ]
+
+# Defaults for a new dealership's alarm config and pricing waterfall.
+# Built once; callers copy the outer sequence into the JSON column
+DEFAULT_ALARM_THRESHOLDS = (30, 45, 60, 75)
+DEFAULT_WATERFALL_RULES = (
+    {"trigger_day": 15, "reduction_pct": 3, "min_margin_floor": 1500},
+    {"trigger_day": 30, "reduction_pct": 5, "min_margin_floor": 1000},
+    {"trigger_day": 45, "reduction_pct": 8, "min_margin_floor": 500},
+    {"trigger_day": 60, "reduction_pct": 12, "min_margin_floor": 0},
+)
+
 # ---------------------------------------------------------------------------
 # DATABASE ENGINE + SESSION
 # ---------------------------------------------------------------------------
 connect_args = {}
+pool_args = {}
 if "sqlite" in DATABASE_URL:
     connect_args = {"check_same_thread": False}
-
-engine = create_engine(DATABASE_URL, connect_args=connect_args, echo=False)
+elif PGBOUNCER:
+    pool_args = {"poolclass": NullPool}
+else:
+    # Sized for the threadpool FastAPI runs sync routes on plus bursts of
+    # batch requests that hold a connection through the analysis loop;
+    # pre-ping + recycle drop connections the Postgres side has already closed
+    pool_args = {
+        "pool_size": 20,
+        "max_overflow": 40,
+        "pool_timeout": 30,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+    }
+
+# Room for every distinct statement the routes issue (default is 500), so the
+# compiled SQL is reused instead of recompiled after cache churn
+engine = create_engine(
+    DATABASE_URL, connect_args=connect_args, echo=False, query_cache_size=1200, **pool_args,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -121,8 +158,35 @@ class User(Base):
     dealership = relationship("Dealership", back_populates="users")
 
 
+class days_since(FunctionElement):
+    """SQL: whole days from `start` to `today`, as an integer."""
+    type = Integer()
+    name = "days_since"
+    inherit_cache = True
+
+
+@compiles(days_since)
+def _days_since_default(element, compiler, **kw):
+    today, start = element.clauses
+    return "CAST(%s - %s AS INTEGER)" % (compiler.process(today, **kw), compiler.process(start, **kw))
+
+
+@compiles(days_since, "sqlite")
+def _days_since_sqlite(element, compiler, **kw):
+    today, start = element.clauses
+    return "CAST(julianday(%s) - julianday(%s) AS INTEGER)" % (
+        compiler.process(today, **kw), compiler.process(start, **kw),
+    )
+
+
 class Vehicle(Base):
     __tablename__ = "vehicles"
+    __table_args__ = (
+        # Every inventory listing filters on dealership + status. The
+        # days_in_inventory ordering is a derived expression, so it stays
+        # out of the index
+        Index("ix_vehicles_dealership_status", "dealership_id", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     dealership_id = Column(Integer, ForeignKey("dealerships.id"), nullable=False)
@@ -148,7 +212,9 @@ class Vehicle(Base):
 
     # Tracking
     date_acquired = Column(Date, default=date.today)
-    days_in_inventory = Column(Integer, default=0)
+    # Stored count — only authoritative once a vehicle leaves active status;
+    # read days_in_inventory (hybrid below) instead
+    stored_days_in_inventory = Column("days_in_inventory", Integer, default=0)
     date_sold = Column(Date, nullable=True)
     sold_price = Column(Float, nullable=True)
 
@@ -158,10 +224,33 @@ class Vehicle(Base):
     # Relationships
     dealership = relationship("Dealership", back_populates="vehicles")
     signals = relationship("VehicleSignals", back_populates="vehicle", uselist=False)
-    comps = relationship("Comp", back_populates="vehicle")
     comp_summary = relationship("CompSummary", back_populates="vehicle", uselist=False)
-    analysis_reports = relationship("AnalysisReport", back_populates="vehicle")
-    price_events = relationship("PriceEventLog", back_populates="vehicle")
+    # Unbounded collections raise on lazy access — load them with an explicit
+    # query or selectinload() so a per-vehicle loop can't turn into N+1
+    comps = relationship("Comp", back_populates="vehicle", lazy="raise")
+    analysis_reports = relationship("AnalysisReport", back_populates="vehicle", lazy="raise")
+    price_events = relationship("PriceEventLog", back_populates="vehicle", lazy="raise")
+
+    @hybrid_property
+    def days_in_inventory(self):
+        """Live for active vehicles (from date_acquired), frozen stored value otherwise."""
+        if self.date_acquired and self.status == VehicleStatus.active:
+            return (date.today() - self.date_acquired).days
+        return self.stored_days_in_inventory
+
+    @days_in_inventory.setter
+    def days_in_inventory(self, value):
+        self.stored_days_in_inventory = value
+
+    @days_in_inventory.expression
+    def days_in_inventory(cls):
+        return case(
+            (
+                and_(cls.status == VehicleStatus.active, cls.date_acquired.isnot(None)),
+                days_since(bindparam("today", date.today(), type_=Date), cls.date_acquired),
+            ),
+            else_=cls.stored_days_in_inventory,
+        )
 
     @property
     def total_cost(self):
@@ -192,6 +281,9 @@ class VehicleSignals(Base):
 
 class Comp(Base):
     __tablename__ = "comps"
+    __table_args__ = (
+        Index("ix_comps_vehicle_source", "vehicle_id", "source"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     vehicle_id = Column(Integer, ForeignKey("vehicles.id"), nullable=False)
@@ -243,6 +335,10 @@ class CompSummary(Base):
 
 class AnalysisReport(Base):
     __tablename__ = "analysis_reports"
+    __table_args__ = (
+        # Latest-report lookups; a btree serves DESC scans just as well
+        Index("ix_reports_vehicle_computed", "vehicle_id", "computed_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     vehicle_id = Column(Integer, ForeignKey("vehicles.id"), nullable=False)
@@ -285,7 +381,7 @@ class AnalysisReport(Base):
     change_triggers = Column(JSON)  # list of strings
     confidence = Column(SAEnum(Confidence))
 
-    # Day-by-day curve (90 items)
+    # Day-by-day curve, columnar: {key: [90 values]}
     daily_curve = Column(JSON)
 
     computed_at = Column(DateTime, default=datetime.utcnow)
@@ -295,6 +391,9 @@ class AnalysisReport(Base):
 
 class FloorplanAlarm(Base):
     __tablename__ = "floorplan_alarms"
+    __table_args__ = (
+        Index("ix_alarms_dealership_created", "dealership_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     dealership_id = Column(Integer, ForeignKey("dealerships.id"), nullable=False)
@@ -318,7 +417,7 @@ class AlarmConfig(Base):
     id = Column(Integer, primary_key=True, index=True)
     dealership_id = Column(Integer, ForeignKey("dealerships.id"), nullable=False, unique=True)
 
-    thresholds = Column(JSON, default=[30, 45, 60, 75])
+    thresholds = Column(JSON, default=list(DEFAULT_ALARM_THRESHOLDS))
     enabled = Column(Boolean, default=True)
     email_targets = Column(JSON, default=[])  # list of email strings
     alarm_hour = Column(Integer, default=6)  # local time hour
@@ -334,12 +433,7 @@ class PricingWaterfallSettings(Base):
 
     # Default waterfall rules as JSON array
     # Each rule: {trigger_day, price_reduction_pct, min_margin_floor, stop_at_wholesale: bool}
-    rules = Column(JSON, default=[
-        {"trigger_day": 15, "reduction_pct": 3, "min_margin_floor": 1500},
-        {"trigger_day": 30, "reduction_pct": 5, "min_margin_floor": 1000},
-        {"trigger_day": 45, "reduction_pct": 8, "min_margin_floor": 500},
-        {"trigger_day": 60, "reduction_pct": 12, "min_margin_floor": 0},
-    ])
+    rules = Column(JSON, default=list(DEFAULT_WATERFALL_RULES))
     price_floor_policy = Column(String(50), default="total_cost")  # total_cost or wholesale
     auto_mode = Column(Boolean, default=False)  # future: auto-apply
 
@@ -350,6 +444,10 @@ class PricingWaterfallSettings(Base):
 
 class PriceEventLog(Base):
     __tablename__ = "price_event_log"
+    __table_args__ = (
+        Index("ix_price_events_dealership_created", "dealership_id", "created_at"),
+        Index("ix_price_events_vehicle_created", "vehicle_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     vehicle_id = Column(Integer, ForeignKey("vehicles.id"), nullable=False)
@@ -365,6 +463,21 @@ class PriceEventLog(Base):
     vehicle = relationship("Vehicle", back_populates="price_events")
 
 
+class VinDecodeCache(Base):
+    __tablename__ = "vin_decode_cache"
+
+    # A VIN always decodes the same way, so entries are shared across
+    # dealerships and never expire
+    vin = Column(String(17), primary_key=True)
+    year = Column(Integer)
+    make = Column(String(100))
+    model = Column(String(100))
+    trim = Column(String(100))
+    body_style = Column(String(100))
+    engine = Column(String(200))
+    fetched_at = Column(DateTime, default=datetime.utcnow)
+
+
 # ---------------------------------------------------------------------------
 # CREATE ALL TABLES
 # ---------------------------------------------------------------------------
@@ -1,11 +1,16 @@
 # backend/schemas.py — All Pydantic Schemas (Part 1 of 2)
 
-from pydantic import BaseModel, Field
-from typing import Optional, List, Any
+from pydantic import BaseModel, ConfigDict, StringConstraints
+from typing import Annotated, Optional, List, Any, Dict, NamedTuple
 from datetime import date, datetime
 from enum import Enum
 
 
+class BaseOut(BaseModel):
+    """Base for every Out schema built from SQLAlchemy rows."""
+    model_config = ConfigDict(from_attributes=True)
+
+
 # ---------------------------------------------------------------------------
 # ENUMS (mirror SQLAlchemy enums for Pydantic)
 # ---------------------------------------------------------------------------
@@ -59,15 +64,12 @@ class DealershipCreate(BaseModel):
     timezone: str = "America/Chicago"
 
 
-class DealershipOut(BaseModel):
+class DealershipOut(BaseOut):
     id: int
     name: str
     timezone: str
     created_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
 # ---------------------------------------------------------------------------
 # USER
@@ -78,22 +80,28 @@ class UserCreate(BaseModel):
     role: str = "manager"
 
 
-class UserOut(BaseModel):
+class UserOut(BaseOut):
     id: int
     dealership_id: int
     email: str
     name: str
     role: str
 
-    class Config:
-        from_attributes = True
-
 
 # ---------------------------------------------------------------------------
 # VEHICLE
 # ---------------------------------------------------------------------------
+# 17 characters from the VIN alphabet (no I, O or Q), checked in one regex
+# scan. The pattern runs before to_upper, so it admits either case; the
+# value comes out upper-cased and callers use it as-is
+VinStr = Annotated[
+    str,
+    StringConstraints(pattern=r"^[A-HJ-NPR-Za-hj-npr-z0-9]{17}$", strip_whitespace=True, to_upper=True),
+]
+
+
 class VinAddRequest(BaseModel):
-    vin: str = Field(..., min_length=17, max_length=17)
+    vin: VinStr
     # Optional overrides at creation time
     acquisition_cost: Optional[float] = None
     recon_cost: Optional[float] = None
@@ -124,34 +132,32 @@ class VehicleUpdate(BaseModel):
     sold_price: Optional[float] = None
 
 
-class VehicleOut(BaseModel):
+class VehicleOut(BaseOut):
     id: int
     dealership_id: int
     vin: str
-    status: VehicleStatusEnum
+    # VehicleUpdate accepts explicit nulls, so anything it can set is nullable here
+    status: Optional[VehicleStatusEnum]
     year: Optional[int]
     make: Optional[str]
     model: Optional[str]
     trim: Optional[str]
     body_style: Optional[str]
     engine: Optional[str]
-    acquisition_cost: float
-    recon_cost: float
-    list_price: float
-    floorplan_rate_apr: float
-    wholesale_exit_price: float
-    min_acceptable_margin: float
-    mileage: int
+    acquisition_cost: Optional[float]
+    recon_cost: Optional[float]
+    list_price: Optional[float]
+    floorplan_rate_apr: Optional[float]
+    wholesale_exit_price: Optional[float]
+    min_acceptable_margin: Optional[float]
+    mileage: Optional[int]
     date_acquired: Optional[date]
-    days_in_inventory: int
+    days_in_inventory: Optional[int]
     date_sold: Optional[date]
     sold_price: Optional[float]
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
 # ---------------------------------------------------------------------------
 # VEHICLE SIGNALS
@@ -165,7 +171,7 @@ class SignalsUpdate(BaseModel):
     notes: Optional[str] = None
 
 
-class SignalsOut(BaseModel):
+class SignalsOut(BaseOut):
     id: int
     vehicle_id: int
     views_total: int
@@ -176,9 +182,6 @@ class SignalsOut(BaseModel):
     notes: str
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
 # ---------------------------------------------------------------------------
 # COMPS
@@ -197,7 +200,7 @@ class CompManualAdd(BaseModel):
     listing_status: str = "active"
 
 
-class CompOut(BaseModel):
+class CompOut(BaseOut):
     id: int
     vehicle_id: int
     source: CompSourceEnum
@@ -215,11 +218,8 @@ class CompOut(BaseModel):
     listing_status: str
     found_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
-class CompSummaryOut(BaseModel):
+class CompSummaryOut(BaseOut):
     id: int
     vehicle_id: int
     auto_count: int
@@ -237,13 +237,11 @@ class CompSummaryOut(BaseModel):
     weighted_source: Optional[str]
     weight_reason: Optional[str]
     computed_at: datetime
-
-    class Config:
-        from_attributes = True
       # ---------------------------------------------------------------------------
 # ANALYSIS — Daily Curve Point
 # ---------------------------------------------------------------------------
-class DailyCurvePoint(BaseModel):
+class DailyCurvePoint(NamedTuple):
+    """One day of a DailyCurve. Only built by DailyCurve.points, never validated."""
     day: int
     daily_sell_probability: float
     cumulative_sell_probability: float
@@ -251,10 +249,69 @@ class DailyCurvePoint(BaseModel):
     gross_erosion_to_date: float
 
 
+class DailyCurve(BaseModel):
+    """Columnar curve — one list per metric, index i is day i + 1."""
+    day: List[int]
+    daily_sell_probability: List[float]
+    cumulative_sell_probability: List[float]
+    floorplan_cost_to_date: List[float]
+    gross_erosion_to_date: List[float]
+
+    @property
+    def points(self) -> List[DailyCurvePoint]:
+        """Per-day view, built on access."""
+        return list(map(DailyCurvePoint._make, zip(
+            self.day,
+            self.daily_sell_probability,
+            self.cumulative_sell_probability,
+            self.floorplan_cost_to_date,
+            self.gross_erosion_to_date,
+        )))
+
+
+# ---------------------------------------------------------------------------
+# ANALYSIS — Report Summary (scalars only: no curve, free text or lists)
+# ---------------------------------------------------------------------------
+class AnalysisReportSummaryOut(BaseOut):
+    id: int
+    vehicle_id: int
+
+    # Probabilities
+    p30: float
+    p60: float
+    p90: float
+
+    # Aging
+    aging_class: AgingClassEnum
+    daily_carry_cost: float
+    carry_cost_30: float
+    carry_cost_60: float
+    carry_cost_90: float
+    margin_erosion_30: float
+    margin_erosion_60: float
+    margin_erosion_90: float
+    inflection_day: int
+
+    # Pricing strategy
+    price_action: PriceActionEnum
+    price_change_amount: float
+    price_action_lift_p: float
+    price_action_gross_impact: float
+    price_elasticity: ElasticityEnum
+
+    # Exit path
+    optimal_exit: ExitPathEnum
+    exit_expected_gross: float
+    exit_expected_days: float
+
+    confidence: ConfidenceEnum
+    computed_at: datetime
+
+
 # ---------------------------------------------------------------------------
 # ANALYSIS — Full Report
 # ---------------------------------------------------------------------------
-class AnalysisReportOut(BaseModel):
+class AnalysisReportOut(BaseOut):
     id: int
     vehicle_id: int
 
@@ -295,18 +352,15 @@ class AnalysisReportOut(BaseModel):
     confidence: ConfidenceEnum
 
     # Curve
-    daily_curve: List[DailyCurvePoint]
+    daily_curve: DailyCurve
 
     computed_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
 # ---------------------------------------------------------------------------
 # ANALYSIS — Lightweight Insight (list view)
 # ---------------------------------------------------------------------------
-class VehicleInsight(BaseModel):
+class VehicleInsight(BaseOut):
     vehicle_id: int
     vin: str
     year: Optional[int]
@@ -328,14 +382,39 @@ class VehicleInsight(BaseModel):
     price_action: Optional[PriceActionEnum] = None
     one_line_action: Optional[str] = None
 
-    class Config:
-        from_attributes = True
-
 
 # ---------------------------------------------------------------------------
 # FLOORPLAN ALARM
 # ---------------------------------------------------------------------------
-class AlarmOut(BaseModel):
+class ThresholdCrossingEntry(BaseModel):
+    vehicle_id: int
+    vin: str
+    days: int
+
+
+class UnderwaterVehicleEntry(BaseModel):
+    vehicle_id: int
+    vin: str
+    year: Optional[int]
+    make: Optional[str]
+    model: Optional[str]
+    net_gross: float
+    days: int
+
+
+class TopBurnerEntry(BaseModel):
+    vehicle_id: int
+    vin: str
+    year: Optional[int]
+    make: Optional[str]
+    model: Optional[str]
+    daily_cost: float
+    days: int
+    total_carry: float
+    net_gross: float
+
+
+class AlarmOut(BaseOut):
     id: int
     dealership_id: int
     alarm_date: date
@@ -343,15 +422,13 @@ class AlarmOut(BaseModel):
     total_daily_burn: float
     projected_burn_30: float
     projected_burn_60: float
-    top_burners: List[Any]
-    threshold_crossings: Any
-    underwater_vehicles: List[Any]
+    top_burners: List[TopBurnerEntry]
+    # Keyed by threshold day, as a string ("30", "45", ...)
+    threshold_crossings: Dict[str, List[ThresholdCrossingEntry]]
+    underwater_vehicles: List[UnderwaterVehicleEntry]
     executive_summary: str
     created_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
 class AlarmConfigUpdate(BaseModel):
     thresholds: Optional[List[int]] = None
@@ -360,7 +437,7 @@ class AlarmConfigUpdate(BaseModel):
     alarm_hour: Optional[int] = None
 
 
-class AlarmConfigOut(BaseModel):
+class AlarmConfigOut(BaseOut):
     id: int
     dealership_id: int
     thresholds: List[int]
@@ -368,9 +445,6 @@ class AlarmConfigOut(BaseModel):
     email_targets: List[str]
     alarm_hour: int
 
-    class Config:
-        from_attributes = True
-
 
 # ---------------------------------------------------------------------------
 # PRICING WATERFALL
@@ -387,17 +461,14 @@ class WaterfallSettingsUpdate(BaseModel):
     auto_mode: Optional[bool] = None
 
 
-class WaterfallSettingsOut(BaseModel):
+class WaterfallSettingsOut(BaseOut):
     id: int
     dealership_id: int
-    rules: List[Any]
+    rules: List[WaterfallRule]
     price_floor_policy: str
     auto_mode: bool
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
 class WaterfallStepOut(BaseModel):
     step: int
@@ -424,20 +495,18 @@ class WaterfallPlanOut(BaseModel):
 # ---------------------------------------------------------------------------
 # PRICE EVENT LOG
 # ---------------------------------------------------------------------------
-class PriceEventOut(BaseModel):
+class PriceEventOut(BaseOut):
     id: int
     vehicle_id: int
     dealership_id: int
     event_type: str
-    old_price: float
-    new_price: float
+    # A status change logs the list price on both sides, and it can be null
+    old_price: Optional[float]
+    new_price: Optional[float]
     reason: str
     triggered_by: str
     created_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
 # ---------------------------------------------------------------------------
 # GENERIC RESPONSES
@@ -16,6 +16,15 @@ const API = axios.create({
   headers: { 'X-Dealership-ID': '1' },
 })
 
+// Poll a background job until it finishes; resolves with the job record
+const waitForJob = async (jobId, intervalMs = 1000) => {
+  for (;;) {
+    const { data } = await API.get(`/api/jobs/${jobId}`)
+    if (data.state === 'success' || data.state === 'failure') return data
+    await new Promise(r => setTimeout(r, intervalMs))
+  }
+}
+
 // ---------------------------------------------------------------------------
 // STYLES (inline object — premium black/charcoal theme)
 // ---------------------------------------------------------------------------
@@ -367,7 +376,9 @@ function Dashboard({ insights, alarm, vehicles, onSelect, onRefresh }) {
   const analyzeAll = async () => {
     try {
       await API.post('/api/vehicles/refresh-all-comps')
-      await API.post('/api/vehicles/analyze-all')
+      const res = await API.post('/api/vehicles/analyze-all')
+      const job = await waitForJob(res.data.detail.job_id)
+      if (job.state === 'failure') console.error(job.error)
       onRefresh()
     } catch (e) {
       console.error(e)
@@ -623,8 +634,8 @@ function AddVehicle({ onAdded }) {
 
       // Auto-refresh comps and analyze
       try {
-        await API.post(`/api/vehicle/${res.data.id}/comps/refresh`)
-        await API.post(`/api/vehicle/${{res.data.id}/analyze`)
+        await API.post(`/api/vehicles/${res.data.id}/comps/refresh`)
+        await API.post(`/api/vehicles/${res.data.id}/analyze`)
       } catch (e) {
         // Non-fatal
       }
@@ -1042,8 +1053,18 @@ function AnalysisPanel({ report }) {
 // ---------------------------------------------------------------------------
 // 90-DAY CURVE CHART (Hoverable)
 // ---------------------------------------------------------------------------
+// The API sends the curve columnar ({ day: [...], daily_sell_probability: [...] });
+// reports saved before that are a list of per-day points.
+function curvePoints(curve) {
+  if (!curve) return []
+  if (Array.isArray(curve)) return curve
+  const keys = Object.keys(curve)
+  return (curve.day || []).map((_, i) => Object.fromEntries(keys.map(k => [k, curve[k][i]])))
+}
+
 function CurveChart({ curve, inflectionDay }) {
-  if (!curve || curve.length === 0) return null
+  const points = curvePoints(curve)
+  if (points.length === 0) return null
 
   const CustomTooltip = ({ active, payload }) => {
     if (!active || !payload || !payload.length) return null
@@ -1078,7 +1099,7 @@ function CurveChart({ curve, inflectionDay }) {
   }
 
   // Add inflection marker to data
-  const chartData = curve.map(d => ({
+  const chartData = points.map(d => ({
     ...d,
     cumPct: d.cumulative_sell_probability * 100,
     dailyPct: d.daily_sell_probability * 100,